@@ -6,7 +6,11 @@ It uses the BotManager to control the lifecycle of the cloned bots.
 
 import logging
 import asyncio
+import os
+import signal
+import sys
 import re
+import sqlite3
 from typing import Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -25,8 +29,10 @@ from config import (
     LOG_LEVEL,
     LOG_FILE,
     REQUEST_TIMEOUT,
+    POLL_TIMEOUT,
     CONNECT_TIMEOUT,
-    DATABASE_PATH
+    DATABASE_PATH,
+    WEBHOOK_URL
 )
 from database import Database
 from manager import BotManager
@@ -227,12 +233,19 @@ async def clone_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     manager: BotManager = context.bot_data['manager']
     
     # 1. Save configuration to database
-    bot_id = db.add_cloned_bot(
-        bot_token=user_data['bot_token'],
-        source_channel_id=user_data['source_channel_id'],
-        destination_channel_id=user_data['destination_channel_id'],
-        owner_chat_id=query.from_user.id
-    )
+    try:
+        bot_id = db.add_cloned_bot(
+            bot_token=user_data['bot_token'],
+            source_channel_id=user_data['source_channel_id'],
+            destination_channel_id=user_data['destination_channel_id'],
+            owner_chat_id=query.from_user.id
+        )
+    except sqlite3.Error:
+        await query.edit_message_text(
+            "❌ **Launch Failed:** The bot configuration could not be saved. Please try again later or contact support.",
+            parse_mode='Markdown'
+        )
+        return ConversationHandler.END
     
     if bot_id is None:
         await query.edit_message_text(
@@ -243,7 +256,7 @@ async def clone_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
 
     # 2. Start the new bot process
     new_bot_config = db.get_cloned_bot_by_id(bot_id)
-    manager.spawn_bot_process(new_bot_config)
+    await manager.spawn_bot_process(new_bot_config)
     
     await query.edit_message_text(
         f"🎉 **Success!** Your new forwarding bot has been launched.\n\n"
@@ -350,22 +363,22 @@ async def admin_action_callback(update: Update, context: ContextTypes.DEFAULT_TY
     result_message = f"✅ Action '{action.upper()}' on Bot ID {bot_id} "
     
     if action == 'stop':
-        if manager.stop_bot_by_id(bot_id):
+        if await manager.stop_bot_by_id(bot_id):
             result_message += "executed successfully. Status: STOPPED."
         else:
             result_message = f"❌ Failed to stop Bot ID {bot_id}. It may not have been running."
             
     elif action == 'start':
-        manager.spawn_bot_process(bot_config)
+        await manager.spawn_bot_process(bot_config)
         result_message += "executed successfully. Status: RUNNING."
         
     elif action == 'restart':
-        manager.stop_bot_by_id(bot_id)
-        manager.spawn_bot_process(bot_config)
+        await manager.stop_bot_by_id(bot_id)
+        await manager.spawn_bot_process(bot_config)
         result_message += "executed successfully. Status: RESTARTED."
         
     elif action == 'delete':
-        manager.stop_bot_by_id(bot_id)
+        await manager.stop_bot_by_id(bot_id)
         if db.delete_cloned_bot(bot_id):
             result_message += "executed successfully. Configuration DELETED."
         else:
@@ -417,9 +430,11 @@ async def main():
     application.add_handler(CallbackQueryHandler(admin_action_callback, pattern='^admin_(start|stop|restart|delete)_\d+$'))
     application.add_handler(CallbackQueryHandler(start_command, pattern='^start$')) # Back button from admin dashboard
 
-    # --- Start Bot Manager and Monitoring ---
-    manager.start_all_cloned_bots()
-    await manager.start_monitoring()
+    # --- Start Bot Manager (each bot process is supervised by its own task) ---
+    if WEBHOOK_URL:
+        # The forwarders' webhook updates all arrive on PORT and are relayed by the manager
+        await manager.start_webhook_router()
+    await manager.start_all_cloned_bots()
 
     # --- Start the Manager Bot ---
     try:
@@ -427,14 +442,18 @@ async def main():
         await application.start()
         await application.updater.start_polling(
             allowed_updates=Update.ALL_TYPES,
-            timeout=REQUEST_TIMEOUT,
+            timeout=POLL_TIMEOUT,
             connect_timeout=CONNECT_TIMEOUT,
         )
         logger.info("Manager Bot started successfully and is polling for updates")
         
-        # Keep the bot running
-        while True:
-            await asyncio.sleep(1)
+        # Keep the bot running until SIGINT or SIGTERM
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+        await stop_event.wait()
+        logger.info("Shutdown signal received")
             
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
@@ -442,7 +461,7 @@ async def main():
         logger.error(f"Fatal error in Manager Bot: {e}")
     finally:
         # Stop all managed bots and the manager bot itself
-        manager.stop_all_bots()
+        await manager.stop_all_bots()
         if application:
             await application.updater.stop()
             await application.stop()
@@ -451,4 +470,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Before Python 3.12 asyncio waits on each child process from its own thread; a pidfd watcher needs none
+    if sys.version_info < (3, 12) and hasattr(os, "pidfd_open"):
+        asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
     asyncio.run(main())
@@ -3,6 +3,7 @@ Configuration file for Telegram Channel Forwarder Bot
 """
 
 import os
+import warnings
 from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
@@ -22,16 +23,56 @@ BATCH_INTERVAL_SECONDS = BATCH_INTERVAL_MINUTES * 60
 MESSAGES_PER_MINUTE = MESSAGES_PER_BATCH / BATCH_INTERVAL_MINUTES
 DELAY_PER_MESSAGE = BATCH_INTERVAL_SECONDS / MESSAGES_PER_BATCH  # Delay in seconds between messages
 
+# Real-time messages are forwarded in batches of up to FORWARD_BATCH_SIZE (Bot API maximum is 100),
+# flushed as soon as the batch is full or FORWARD_BATCH_WAIT_SECONDS after its first message
+FORWARD_BATCH_SIZE = int(os.getenv("FORWARD_BATCH_SIZE", "100"))
+FORWARD_BATCH_WAIT_SECONDS = float(os.getenv("FORWARD_BATCH_WAIT_SECONDS", "1.0"))
+QUEUE_MAX = int(os.getenv("QUEUE_MAX", "5000"))  # Pending real-time messages kept before the oldest is dropped
+
+# Forwarded-message records are written by a background task in batches of up to DB_WRITE_BATCH_SIZE rows,
+# flushed as soon as the batch is full or DB_WRITE_BATCH_WAIT_SECONDS after its first row
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "200"))
+DB_WRITE_BATCH_WAIT_SECONDS = float(os.getenv("DB_WRITE_BATCH_WAIT_SECONDS", "0.5"))
+DB_WRITE_QUEUE_MAX = int(os.getenv("DB_WRITE_QUEUE_MAX", "10000"))
+
+# Forwarder instances buffer error_log rows in memory and write them every ERROR_FLUSH_INTERVAL_SECONDS;
+# at most ERROR_BUFFER_MAX rows are kept, dropping the oldest during an error storm
+ERROR_FLUSH_INTERVAL_SECONDS = float(os.getenv("ERROR_FLUSH_INTERVAL_SECONDS", "2.0"))
+ERROR_BUFFER_MAX = int(os.getenv("ERROR_BUFFER_MAX", "10000"))
+
+# Historical forwarding progress is persisted when either threshold is reached
+PROGRESS_FLUSH_INTERVAL_SECONDS = float(os.getenv("PROGRESS_FLUSH_INTERVAL_SECONDS", "2.0"))
+PROGRESS_FLUSH_MESSAGES = int(os.getenv("PROGRESS_FLUSH_MESSAGES", "200"))
+HISTORY_RECORD_BATCH_SIZE = int(os.getenv("HISTORY_RECORD_BATCH_SIZE", "500"))  # Forwarded rows written per bulk insert
+
 # Database Configuration
 DATABASE_PATH = os.getenv("DATABASE_PATH", "forwarder_bot.db")
 
+# Bot Manager Configuration
+SPAWN_CONCURRENCY = int(os.getenv("SPAWN_CONCURRENCY", "8"))  # Bot processes started at the same time on startup
+RESTART_BACKOFF_MAX_SECONDS = float(os.getenv("RESTART_BACKOFF_MAX_SECONDS", "300"))  # Upper bound for the delay before restarting a crashed bot
+MAX_RESTART_ATTEMPTS = int(os.getenv("MAX_RESTART_ATTEMPTS", "10"))  # Consecutive quick crashes before a bot is marked 'error'
+STDERR_TAIL_LINES = int(os.getenv("STDERR_TAIL_LINES", "50"))  # Last stderr lines of a crashed bot included in the manager log
+STOP_TIMEOUT_SECONDS = float(os.getenv("STOP_TIMEOUT_SECONDS", "10"))  # How long shutdown waits for terminated bots to exit
+
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FILE = os.getenv("LOG_FILE", "forwarder_bot.log")
 
 # Bot Configuration
-REQUEST_TIMEOUT = 30  # Timeout for API requests in seconds
+REQUEST_TIMEOUT = 60  # Timeout for API requests in seconds
+POLL_TIMEOUT = 50  # Long polling: getUpdates waits up to this many seconds for new updates
 CONNECT_TIMEOUT = 10  # Timeout for connection in seconds
+CONNECTION_POOL_SIZE = int(os.getenv("CONNECTION_POOL_SIZE", "64"))  # Concurrent connections to the Bot API
+HTTP_VERSION = os.getenv("HTTP_VERSION", "1.1")  # Set to "2" to multiplex requests over one connection (needs httpx[http2])
+
+# Webhook Configuration (polling is used when WEBHOOK_URL is not set)
+# Telegram posts each instance's updates to WEBHOOK_URL/<instance ID>. The manager alone listens on PORT and
+# relays them to the instance, which listens on localhost at WEBHOOK_INTERNAL_PORT + instance ID
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("PORT", "8443"))
+WEBHOOK_INTERNAL_PORT = int(os.getenv("WEBHOOK_INTERNAL_PORT", "20000"))
 
 # Telethon Configuration (Owner Only for Historical Forwarding)
 TELETHON_API_ID = os.getenv("TELETHON_API_ID")
@@ -48,18 +89,13 @@ FORWARD_REAL_TIME_MESSAGES = os.getenv("FORWARD_REAL_TIME_MESSAGES", "true").low
 
 # Validation
 if BOT_TOKEN == "your_bot_token_here":
-    print("WARNING: BOT_TOKEN not configured. Please set BOT_TOKEN environment variable.")
+    warnings.warn("BOT_TOKEN not configured. Please set BOT_TOKEN environment variable.", RuntimeWarning)
 
 if SOURCE_CHANNEL_ID == -1001234567890:
-    print("WARNING: SOURCE_CHANNEL_ID not configured. Please set SOURCE_CHANNEL_ID environment variable.")
+    warnings.warn("SOURCE_CHANNEL_ID not configured. Please set SOURCE_CHANNEL_ID environment variable.", RuntimeWarning)
 
 if DESTINATION_CHANNEL_ID == -1009876543210:
-    print("WARNING: DESTINATION_CHANNEL_ID not configured. Please set DESTINATION_CHANNEL_ID environment variable.")
-
-# Validation
-if BOT_TOKEN == "your_bot_token_here":
-    print("WARNING: BOT_TOKEN not configured. Please set BOT_TOKEN environment variable.")
+    warnings.warn("DESTINATION_CHANNEL_ID not configured. Please set DESTINATION_CHANNEL_ID environment variable.", RuntimeWarning)
 
 if OWNER_ID == 0:
-    print("WARNING: OWNER_ID not configured. Please set OWNER_ID environment variable to your Telegram User ID.")
-    print("WARNING: DESTINATION_CHANNEL_ID not configured. Please set DESTINATION_CHANNEL_ID environment variable.")
+    warnings.warn("OWNER_ID not configured. Please set OWNER_ID environment variable to your Telegram User ID.", RuntimeWarning)
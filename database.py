@@ -5,1762 +5,191 @@ Handles all database operations including tracking forwarded messages and bot st
 
 import sqlite3
 import logging
+import asyncio
+import threading
+import atexit
+import weakref
+from collections import deque
 from datetime import datetime
-from typing import Optional, List, Tuple
-from config import DATABASE_PATH
+from typing import Optional, List, Tuple, Dict, Sequence
+from config import DATABASE_PATH, ERROR_BUFFER_MAX
 
 logger = logging.getLogger(__name__)
 
+# Schema for both the main database (cloned_bots) and the per-instance databases; every statement is idempotent
+SCHEMA_SQL = """
+-- Table for tracking forwarded messages (source_message_id is UNIQUE, which already indexes it)
+CREATE TABLE IF NOT EXISTS forwarded_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_message_id INTEGER NOT NULL UNIQUE,
+    destination_message_id INTEGER,
+    forwarded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    message_type TEXT,
+    error_message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_forwarded_at ON forwarded_messages(forwarded_at);
+-- Duplicate of the UNIQUE index, created by earlier versions
+DROP INDEX IF EXISTS idx_source_message_id;
+
+-- Table for managing cloned bot instances (Main Bot's database)
+CREATE TABLE IF NOT EXISTS cloned_bots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bot_token TEXT NOT NULL UNIQUE,
+    source_channel_id TEXT NOT NULL,
+    destination_channel_id TEXT NOT NULL,
+    owner_chat_id INTEGER NOT NULL,
+    status TEXT DEFAULT 'pending',
+    process_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- Owner lookups, with or without a status filter, seek on this one index; it also carries every column in
+-- _BOT_COLS (id is the rowid), so they are answered from the index alone. Supersedes idx_owner_chat_id
+-- and the narrower idx_owner_status
+CREATE INDEX IF NOT EXISTS idx_owner_status_covering ON cloned_bots(
+    owner_chat_id, status, bot_token, source_channel_id, destination_channel_id, process_id
+);
+DROP INDEX IF EXISTS idx_owner_chat_id;
+DROP INDEX IF EXISTS idx_owner_status;
+CREATE INDEX IF NOT EXISTS idx_status ON cloned_bots(status);
+
+-- Table for bot state and configuration
+CREATE TABLE IF NOT EXISTS bot_state (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    value TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Table for tracking historical forwarding progress
+CREATE TABLE IF NOT EXISTS forwarding_progress (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    last_forwarded_message_id INTEGER,
+    total_messages_forwarded INTEGER DEFAULT 0,
+    historical_forwarding_complete BOOLEAN DEFAULT 0,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Table for error logging
+CREATE TABLE IF NOT EXISTS error_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    error_type TEXT,
+    error_message TEXT,
+    source_message_id INTEGER,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- get_recent_errors walks this backwards instead of sorting the whole table
+CREATE INDEX IF NOT EXISTS idx_error_timestamp ON error_log(timestamp);
+"""
 
-class Database:
-    """Database handler for the forwarder bot"""
-
-    def __init__(self, db_path: str = DATABASE_PATH):
-        """Initialize database connection"""
-        self.db_path = db_path
-        self.init_database()
-
-    def get_connection(self):
-        """Get a database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
-    def init_database(self):
-        """Initialize database tables if they don't exist"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            # Table for tracking forwarded messages
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS forwarded_messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source_message_id INTEGER NOT NULL UNIQUE,
-                    destination_message_id INTEGER,
-                    forwarded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    message_type TEXT,
-                    error_message TEXT
-                )
-            """)
-
-            # Table for managing cloned bot instances
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-
-            # Table for managing cloned bot instances (Main Bot's database)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-
-            # Table for bot state and configuration
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS bot_state (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    key TEXT NOT NULL UNIQUE,
-                    value TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Table for managing cloned bot instances (Main Bot's database)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-
-            # Table for tracking historical forwarding progress
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS forwarding_progress (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    last_forwarded_message_id INTEGER,
-                    total_messages_forwarded INTEGER DEFAULT 0,
-                    historical_forwarding_complete BOOLEAN DEFAULT 0,
-                    started_at TIMESTAMP,
-                    completed_at TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Table for managing cloned bot instances (Main Bot's database)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-
-            # Table for error logging
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS error_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    error_type TEXT,
-                    error_message TEXT,
-                    source_message_id INTEGER,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Table for managing cloned bot instances (Main Bot's database)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-
-            # Create indexes for better query performance
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_source_message_id 
-                ON forwarded_messages(source_message_id)
-            """)
-
-            # Table for managing cloned bot instances (Main Bot's database)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_forwarded_at 
-                ON forwarded_messages(forwarded_at)
-            """)
-
-            # Table for managing cloned bot instances (Main Bot's database)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-
-            conn.commit()
-            logger.info("Database initialized successfully")
-        except sqlite3.Error as e:
-            logger.error(f"Database initialization error: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
-
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def add_forwarded_message(
-        self,
-        source_message_id: int,
-        destination_message_id: Optional[int] = None,
-        message_type: str = "unknown",
-        error_message: Optional[str] = None
-    ) -> bool:
-        """Add a forwarded message record to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO forwarded_messages 
-                (source_message_id, destination_message_id, message_type, error_message)
-                VALUES (?, ?, ?, ?)
-            """, (source_message_id, destination_message_id, message_type, error_message))
-            conn.commit()
-            logger.debug(f"Recorded forwarded message: {source_message_id}")
-            return True
-        except sqlite3.IntegrityError:
-            logger.warning(f"Message {source_message_id} already recorded as forwarded")
-            return False
-        except sqlite3.Error as e:
-            logger.error(f"Error adding forwarded message: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def is_message_forwarded(self, source_message_id: int) -> bool:
-        """Check if a message has already been forwarded"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                SELECT 1 FROM forwarded_messages 
-                WHERE source_message_id = ?
-            """, (source_message_id,))
-            result = cursor.fetchone()
-            return result is not None
-        except sqlite3.Error as e:
-            logger.error(f"Error checking forwarded message: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_forwarding_progress(self) -> Optional[dict]:
-        """Get the current forwarding progress"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                SELECT * FROM forwarding_progress 
-                ORDER BY id DESC LIMIT 1
-            """)
-
-            # Table for managing cloned bot instances (Main Bot's database)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting forwarding progress: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def update_forwarding_progress(
-        self,
-        last_forwarded_message_id: int,
-        total_messages_forwarded: int,
-        historical_forwarding_complete: bool = False
-    ) -> bool:
-        """Update the forwarding progress"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            progress = self.get_forwarding_progress()
-            
-            if progress:
-                # Update existing progress
-                cursor.execute("""
-                    UPDATE forwarding_progress 
-                    SET last_forwarded_message_id = ?,
-                        total_messages_forwarded = ?,
-                        historical_forwarding_complete = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (last_forwarded_message_id, total_messages_forwarded, 
-                      historical_forwarding_complete, progress['id']))
-            else:
-                # Create new progress record
-                cursor.execute("""
-                    INSERT INTO forwarding_progress 
-                    (last_forwarded_message_id, total_messages_forwarded, 
-                     historical_forwarding_complete, started_at)
-                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                """, (last_forwarded_message_id, total_messages_forwarded, 
-                      historical_forwarding_complete))
-            
-            if historical_forwarding_complete:
-                cursor.execute("""
-                    UPDATE forwarding_progress 
-                    SET completed_at = CURRENT_TIMESTAMP
-                    WHERE id = (SELECT MAX(id) FROM forwarding_progress)
-                """)
-
-            # Table for managing cloned bot instances (Main Bot's database)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloned_bots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_token TEXT NOT NULL UNIQUE,
-                    source_channel_id TEXT NOT NULL,
-                    destination_channel_id TEXT NOT NULL,
-                    owner_chat_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    process_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Index for quick lookup by owner
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_owner_chat_id 
-                ON cloned_bots(owner_chat_id)
-            """)
-
-            # Index for quick lookup by status
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON cloned_bots(status)
-            """)
-            
-            conn.commit()
-            logger.debug(f"Updated forwarding progress: {total_messages_forwarded} messages")
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating forwarding progress: {e}")
-            conn.rollback()
-            return False
-        finally:
-            conn.close()
-
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def set_state(self, key: str, value: str) -> bool:
-        """Set a bot state value"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO bot_state (key, value, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            """, (key, value))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error setting state: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_state(self, key: str) -> Optional[str]:
-        """Get a bot state value"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT value FROM bot_state WHERE key = ?", (key,))
-            row = cursor.fetchone()
-            return row[0] if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting state: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
-
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
-
-    def log_error(
-        self,
-        error_type: str,
-        error_message: str,
-        source_message_id: Optional[int] = None
-    ) -> bool:
-        """Log an error to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                INSERT INTO error_log (error_type, error_message, source_message_id)
-                VALUES (?, ?, ?)
-            """, (error_type, error_message, source_message_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error logging error: {e}")
-            return False
-        finally:
-            conn.close()
+# cloned_bots columns read by the bot, manager and forwarder; the timestamps are never read back
+_BOT_COLS = "id, bot_token, source_channel_id, destination_channel_id, owner_chat_id, status, process_id"
 
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+# Open Database objects, so their cached connections can be closed at interpreter exit
+_open_databases = weakref.WeakSet()
 
-        try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
-        except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
 
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
+@atexit.register
+def _close_all_databases():
+    """Close every cached connection still open at exit"""
+    for db in list(_open_databases):
+        db.close()
 
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
 
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
+async def finish_on_cancel(coro):
+    """Await coro even if the calling task is cancelled meanwhile, so a database write running in a worker
+    thread is never left behind while the connections are closed; the cancellation is re-raised after"""
+    inner = asyncio.ensure_future(coro)
+    try:
+        return await asyncio.shield(inner)
+    except asyncio.CancelledError:
+        await inner
+        raise
 
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
 
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
+class Database:
+    """Database handler for the forwarder bot"""
 
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def __init__(self, db_path: str = DATABASE_PATH, buffer_errors: bool = False):
+        """Initialize database connection"""
+        self.db_path = db_path
+        self._local = threading.local()
+        # Every connection handed out by get_connection, across threads, so close() can reach them all
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        _open_databases.add(self)
+        # With buffer_errors, log_error only queues the row and the owner calls flush_errors periodically;
+        # the oldest entries are discarded if an error storm outruns the flushes
+        self.buffer_errors = buffer_errors
+        self._error_buffer = deque(maxlen=ERROR_BUFFER_MAX)
+        # Source message IDs already recorded, loaded on first lookup so checks stay in memory
+        self._forwarded_ids: Optional[set] = None
+        # Row counts for the status commands, loaded by one COUNT(*) and then kept current on insert
+        self._forwarded_count: Optional[int] = None
+        self._error_count: Optional[int] = None
+        # bot_state key/value pairs, loaded on first read and written through by set_state
+        self._state: Optional[Dict[str, str]] = None
+        # Latest forwarding_progress row; only this instance's historical forwarder writes it
+        self._progress: Optional[dict] = None
+        self.init_database()
 
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
+    def get_connection(self):
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
 
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def _open(self):
+        """Open a connection and apply the per-connection PRAGMAs"""
+        # check_same_thread=False only so close() can run from another thread; each thread still uses its own
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        if self.db_path != ":memory:":
+            # WAL lets readers run alongside the writer, and NORMAL sync is durable under WAL short of power loss
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA busy_timeout=5000")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
 
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
+    def close(self):
+        """Close the database connections opened by every thread"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
             conn.close()
+        self._local = threading.local()
 
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
+    def init_database(self):
+        """Initialize database tables if they don't exist"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+            conn.executescript(SCHEMA_SQL)
+            # Cheap when statistics are current; refreshes them for tables that changed a lot since last run
+            conn.execute("PRAGMA optimize")
+            logger.info("Database initialized successfully")
         except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
+            logger.error("Database initialization error: %s", e)
 
-    def get_forwarded_count(self) -> int:
-        """Get total number of forwarded messages"""
+    def analyze(self) -> bool:
+        """Rebuild the query planner statistics, e.g. after a large bulk load"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT COUNT(*) FROM forwarded_messages")
-            result = cursor.fetchone()
-            return result[0] if result else 0
+            conn.execute("ANALYZE")
+            return True
         except sqlite3.Error as e:
-            logger.error(f"Error getting forwarded count: {e}")
-            return 0
-        finally:
-            conn.close()
+            logger.error("Error analyzing database: %s", e)
+            return False
 
     def add_cloned_bot(
         self,
@@ -1769,439 +198,533 @@ class Database:
         destination_channel_id: str,
         owner_chat_id: int
     ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
+        """Add a new cloned bot configuration to the database; returns None if the token is already
+        registered and raises sqlite3.Error if the insert itself fails"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
+            with conn:
+                bot_id = self._insert_cloned_bots(conn, [(bot_token, source_channel_id, destination_channel_id, owner_chat_id)])[0]
+        except sqlite3.Error as e:
+            logger.error("Error adding cloned bot: %s", e)
+            raise
+
+        if bot_id is None:
+            logger.warning("Cloned bot for owner %s not added: its token is already registered.", owner_chat_id)
             return None
+        logger.info("Added new cloned bot config for owner %s", owner_chat_id)
+        return bot_id
+
+    def add_cloned_bots(self, rows: List[Tuple[str, str, str, int]]) -> Optional[List[Optional[int]]]:
+        """Add many (bot_token, source_channel_id, destination_channel_id, owner_chat_id) rows in one transaction"""
+        # Returns each row's new ID, or None where the token already exists; None overall if the insert failed
+        conn = self.get_connection()
+
+        try:
+            with conn:
+                bot_ids = self._insert_cloned_bots(conn, rows)
+            return bot_ids
         except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
+            logger.error("Error adding cloned bots: %s", e)
             return None
-        finally:
-            conn.close()
 
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
+    def _insert_cloned_bots(self, conn: sqlite3.Connection, rows: List[Tuple[str, str, str, int]]) -> List[Optional[int]]:
+        """Insert cloned bot rows inside the caller's transaction, returning None for each duplicate token"""
+        bot_ids: List[Optional[int]] = []
+        # executemany cannot return rows, so each INSERT runs on its own inside the one transaction
+        for row in rows:
+            # Only a duplicate token is skipped; any other constraint failure still raises
+            inserted = conn.execute("""
+                INSERT INTO cloned_bots 
+                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
+                VALUES (?, ?, ?, ?, 'pending')
+                ON CONFLICT(bot_token) DO NOTHING
+                RETURNING id
+            """, row).fetchone()
+            bot_ids.append(inserted[0] if inserted else None)
+        return bot_ids
+
+    def get_cloned_bots(
+        self,
+        status: Optional[str] = None,
+        owner_chat_id: Optional[int] = None,
+        statuses: Optional[Sequence[str]] = None
+    ) -> List[sqlite3.Row]:
+        """Get a list of all cloned bots, optionally filtered by status (or any of several statuses) and/or owner"""
         conn = self.get_connection()
-        cursor = conn.cursor()
         
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
+        query = f"SELECT {_BOT_COLS} FROM cloned_bots"
+        conditions: List[str] = []
+        params: list = []
         
+        if owner_chat_id is not None:
+            conditions.append("owner_chat_id = ?")
+            params.append(owner_chat_id)
         if status:
-            query += " WHERE status = ?"
+            conditions.append("status = ?")
             params.append(status)
+        if statuses:
+            conditions.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
             
         try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            cursor = conn.execute(query, params)
+            # sqlite3.Row already supports access by column name, so rows are returned without copying
+            return cursor.fetchall()
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
+            logger.error("Error getting cloned bots: %s", e)
             return []
-        finally:
-            conn.close()
 
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
+    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[sqlite3.Row]:
         """Get a cloned bot configuration by its ID"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            return conn.execute(f"SELECT {_BOT_COLS} FROM cloned_bots WHERE id = ?", (bot_id,)).fetchone()
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
+            logger.error("Error getting cloned bot by ID: %s", e)
             return None
-        finally:
-            conn.close()
 
     def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
         """Update the status and process ID of a cloned bot"""
+        return self.set_cloned_bot_status(bot_id, status, process_id) is not None
+
+    def set_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> Optional[sqlite3.Row]:
+        """Update the status (and process ID, if given) of a cloned bot and return the updated row"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            if process_id is not None:
-                cursor.execute("""
+            with conn:
+                cursor = conn.execute(f"""
                     UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
+                    SET status = ?, process_id = COALESCE(?, process_id), updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
+                    RETURNING {_BOT_COLS}
                 """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
+                return cursor.fetchone()
+        except sqlite3.Error as e:
+            logger.error("Error updating cloned bot status: %s", e)
+            return None
+
+    def update_cloned_bot_statuses(self, rows: List[Tuple[int, str, Optional[int]]]) -> bool:
+        """Update the status and process ID of several cloned bots in one transaction"""
+        if not rows:
+            return True
+
+        conn = self.get_connection()
+
+        try:
+            with conn:
+                conn.executemany("""
                     UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
+                    SET status = ?, process_id = COALESCE(?, process_id), updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
+                """, [(status, process_id, bot_id) for bot_id, status, process_id in rows])
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
+            logger.error("Error updating cloned bot statuses: %s", e)
             return False
-        finally:
-            conn.close()
 
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
+    def get_cloned_bot_config(self, bot_token: str) -> Optional[sqlite3.Row]:
         """Get a cloned bot configuration by its token"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            return conn.execute(f"SELECT {_BOT_COLS} FROM cloned_bots WHERE bot_token = ?", (bot_token,)).fetchone()
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
+            logger.error("Error getting cloned bot config by token: %s", e)
             return None
-        finally:
-            conn.close()
 
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
+    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[sqlite3.Row]:
         """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
+        return self.get_cloned_bots(owner_chat_id=owner_chat_id)
 
     def delete_cloned_bot(self, bot_id: int) -> bool:
         """Delete a cloned bot configuration"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
+            with conn:
+                cursor = conn.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
             return cursor.rowcount > 0
         except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
+            logger.error("Error deleting cloned bot: %s", e)
             return False
-        finally:
-            conn.close()
 
-    def get_error_count(self) -> int:
-        """Get total number of errors"""
+    def delete_cloned_bots(self, bot_ids: List[int]) -> int:
+        """Delete several cloned bot configurations and return how many were removed"""
         conn = self.get_connection()
-        cursor = conn.cursor()
+        deleted = 0
 
         try:
-            cursor.execute("SELECT COUNT(*) FROM error_log")
-            result = cursor.fetchone()
-            return result[0] if result else 0
+            with conn:
+                # Stay under SQLite's historical limit of 999 bound parameters per statement
+                for start in range(0, len(bot_ids), 999):
+                    chunk = bot_ids[start:start + 999]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor = conn.execute(f"DELETE FROM cloned_bots WHERE id IN ({placeholders})", chunk)
+                    deleted += cursor.rowcount
+            return deleted
         except sqlite3.Error as e:
-            logger.error(f"Error getting error count: {e}")
+            logger.error("Error deleting cloned bots: %s", e)
             return 0
-        finally:
-            conn.close()
 
-    def add_cloned_bot(
+    def add_forwarded_message(
         self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
+        source_message_id: int,
+        destination_message_id: Optional[int] = None,
+        message_type: str = "unknown",
+        error_message: Optional[str] = None
+    ) -> bool:
+        """Add a forwarded message record to the database"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
+            with conn:
+                cursor = conn.execute("""
+                    INSERT OR IGNORE INTO forwarded_messages 
+                    (source_message_id, destination_message_id, message_type, error_message)
+                    VALUES (?, ?, ?, ?)
+                    RETURNING id
+                """, (source_message_id, destination_message_id, message_type, error_message))
+                inserted = cursor.fetchone() is not None
+            if self._forwarded_ids is not None:
+                self._forwarded_ids.add(source_message_id)
+            if not inserted:
+                logger.debug("Message %s already recorded as forwarded", source_message_id)
+                return False
+            if self._forwarded_count is not None:
+                self._forwarded_count += 1
+            logger.debug("Recorded forwarded message: %s", source_message_id)
+            return True
         except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
-            return None
-        finally:
-            conn.close()
+            logger.error("Error adding forwarded message: %s", e)
+            return False
 
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
+    def add_forwarded_messages_bulk(self, rows: List[Tuple[int, Optional[int], str, Optional[str]]]) -> bool:
+        """Record many (source_message_id, destination_message_id, message_type, error_message) rows in one transaction"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
+
         try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            changes_before = conn.total_changes
+            with conn:
+                conn.executemany("""
+                    INSERT OR IGNORE INTO forwarded_messages 
+                    (source_message_id, destination_message_id, message_type, error_message)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
+            if self._forwarded_ids is not None:
+                self._forwarded_ids.update(row[0] for row in rows)
+            if self._forwarded_count is not None:
+                self._forwarded_count += conn.total_changes - changes_before
+            logger.debug("Recorded %d forwarded messages", len(rows))
+            return True
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
+            logger.error("Error adding forwarded messages: %s", e)
+            return False
 
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
+    def is_message_forwarded(self, source_message_id: int) -> bool:
+        """Check if a message has already been forwarded"""
+        if self._forwarded_ids is None:
+            self._forwarded_ids = self._load_forwarded_ids()
+            if self._forwarded_ids is None:
+                return False
+        return source_message_id in self._forwarded_ids
+
+    def _load_forwarded_ids(self) -> Optional[set]:
+        """Load every recorded source message ID into a set"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            cursor = conn.execute("SELECT source_message_id FROM forwarded_messages")
+            return {row[0] for row in cursor}
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
+            logger.error("Error loading forwarded messages: %s", e)
             return None
-        finally:
-            conn.close()
-
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
 
-        try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
-            return False
-        finally:
-            conn.close()
+    def get_forwarding_progress(self) -> Optional[dict]:
+        """Get the current forwarding progress"""
+        if self._progress is not None:
+            return dict(self._progress)
 
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
+            cursor = conn.execute("""
+                SELECT * FROM forwarding_progress 
+                ORDER BY id DESC LIMIT 1
+            """)
             row = cursor.fetchone()
-            return dict(row) if row else None
+            if row:
+                self._progress = dict(row)
+                return dict(row)
+            return None
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
+            logger.error("Error getting forwarding progress: %s", e)
             return None
-        finally:
-            conn.close()
-
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
 
-        try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+    def update_forwarding_progress(
+        self,
+        last_forwarded_message_id: int,
+        total_messages_forwarded: int,
+        historical_forwarding_complete: bool = False
+    ) -> bool:
+        """Update the forwarding progress"""
+        progress = self.get_forwarding_progress()
+        conn = self.get_connection()
+
+        try:
+            with conn:
+                if progress:
+                    # Update existing progress
+                    cursor = conn.execute("""
+                        UPDATE forwarding_progress 
+                        SET last_forwarded_message_id = ?,
+                            total_messages_forwarded = ?,
+                            historical_forwarding_complete = ?,
+                            completed_at = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE completed_at END,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                        RETURNING *
+                    """, (last_forwarded_message_id, total_messages_forwarded, 
+                          historical_forwarding_complete, historical_forwarding_complete, progress['id']))
+                else:
+                    # Create new progress record
+                    cursor = conn.execute("""
+                        INSERT INTO forwarding_progress 
+                        (last_forwarded_message_id, total_messages_forwarded, 
+                         historical_forwarding_complete, started_at, completed_at)
+                        VALUES (?, ?, ?, CURRENT_TIMESTAMP, CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+                        RETURNING *
+                    """, (last_forwarded_message_id, total_messages_forwarded, 
+                          historical_forwarding_complete, historical_forwarding_complete))
+                row = cursor.fetchone()
+
+            self._progress = dict(row) if row else None
+            logger.debug("Updated forwarding progress: %s messages", total_messages_forwarded)
+            return True
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
+            self._progress = None
+            logger.error("Error updating forwarding progress: %s", e)
+            return False
 
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
+    def set_state(self, key: str, value: str) -> bool:
+        """Set a bot state value"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+            with conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO bot_state (key, value, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                """, (key, value))
+            if self._state is not None:
+                self._state[key] = value
+            return True
         except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
+            logger.error("Error setting state: %s", e)
             return False
-        finally:
-            conn.close()
 
-    def get_recent_errors(self, limit: int = 10) -> List[dict]:
-        """Get recent errors"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                SELECT * FROM error_log 
-                ORDER BY timestamp DESC LIMIT ?
-            """, (limit,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting recent errors: {e}")
-            return []
-        finally:
-            conn.close()
+    def get_state(self, key: str) -> Optional[str]:
+        """Get a bot state value"""
+        if self._state is None:
+            self._state = self._load_state()
+            if self._state is None:
+                return None
+        return self._state.get(key)
 
-    def add_cloned_bot(
-        self,
-        bot_token: str,
-        source_channel_id: str,
-        destination_channel_id: str,
-        owner_chat_id: int
-    ) -> Optional[int]:
-        """Add a new cloned bot configuration to the database"""
+    def _load_state(self) -> Optional[Dict[str, str]]:
+        """Load every bot_state key/value pair into a dict"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                INSERT INTO cloned_bots 
-                (bot_token, source_channel_id, destination_channel_id, owner_chat_id, status)
-                VALUES (?, ?, ?, ?, 'pending')
-            """, (bot_token, source_channel_id, destination_channel_id, owner_chat_id))
-            conn.commit()
-            logger.info(f"Added new cloned bot config for owner {owner_chat_id}")
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            logger.warning(f"Bot with token {bot_token} already exists.")
-            return None
+            cursor = conn.execute("SELECT key, value FROM bot_state")
+            return {row[0]: row[1] for row in cursor}
         except sqlite3.Error as e:
-            logger.error(f"Error adding cloned bot: {e}")
+            logger.error("Error getting state: %s", e)
             return None
-        finally:
-            conn.close()
 
-    def get_cloned_bots(self, status: Optional[str] = None) -> List[dict]:
-        """Get a list of all cloned bots, optionally filtered by status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM cloned_bots"
-        params: List[str] = []
-        
-        if status:
-            query += " WHERE status = ?"
-            params.append(status)
-            
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots: {e}")
-            return []
-        finally:
-            conn.close()
+    def log_error(
+        self,
+        error_type: str,
+        error_message: str,
+        source_message_id: Optional[int] = None
+    ) -> bool:
+        """Log an error to the database"""
+        if self.buffer_errors:
+            timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            self._error_buffer.append((error_type, error_message, source_message_id, timestamp))
+            if self._error_count is not None:
+                self._error_count += 1
+            return True
 
-    def get_cloned_bot_by_id(self, bot_id: int) -> Optional[dict]:
-        """Get a cloned bot configuration by its ID"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE id = ?", (bot_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            with conn:
+                conn.execute("""
+                    INSERT INTO error_log (error_type, error_message, source_message_id)
+                    VALUES (?, ?, ?)
+                """, (error_type, error_message, source_message_id))
+            if self._error_count is not None:
+                self._error_count += 1
+            return True
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot by ID: {e}")
-            return None
-        finally:
-            conn.close()
+            logger.error("Error logging error: %s", e)
+            return False
+
+    def flush_errors(self) -> bool:
+        """Write buffered errors to the database in one transaction"""
+        rows = []
+        while self._error_buffer:
+            rows.append(self._error_buffer.popleft())
+        if not rows:
+            return True
 
-    def update_cloned_bot_status(self, bot_id: int, status: str, process_id: Optional[int] = None) -> bool:
-        """Update the status and process ID of a cloned bot"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            if process_id is not None:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, process_id = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, process_id, bot_id))
-            else:
-                cursor.execute("""
-                    UPDATE cloned_bots 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, bot_id))
-            conn.commit()
+            with conn:
+                conn.executemany("""
+                    INSERT INTO error_log (error_type, error_message, source_message_id, timestamp)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error updating cloned bot status: {e}")
+            logger.error("Error flushing %d buffered errors: %s", len(rows), e)
             return False
-        finally:
-            conn.close()
 
-    def get_cloned_bot_config(self, bot_token: str) -> Optional[dict]:
-        """Get a cloned bot configuration by its token"""
+    def get_forwarded_count(self) -> int:
+        """Get total number of forwarded messages"""
+        if self._forwarded_count is not None:
+            return self._forwarded_count
+
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE bot_token = ?", (bot_token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            result = conn.execute("SELECT COUNT(*) FROM forwarded_messages").fetchone()
+            self._forwarded_count = result[0] if result else 0
+            return self._forwarded_count
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bot config by token: {e}")
-            return None
-        finally:
-            conn.close()
+            logger.error("Error getting forwarded count: %s", e)
+            return 0
+
+    def get_error_count(self) -> int:
+        """Get total number of errors"""
+        if self._error_count is not None:
+            return self._error_count
+
+        # Errors logged before the count is loaded are only counted once they are in the table
+        self.flush_errors()
 
-    def get_cloned_bots_by_owner(self, owner_chat_id: int) -> List[dict]:
-        """Get all cloned bots owned by a specific user"""
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM cloned_bots WHERE owner_chat_id = ?", (owner_chat_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            result = conn.execute("SELECT COUNT(*) FROM error_log").fetchone()
+            self._error_count = result[0] if result else 0
+            return self._error_count
         except sqlite3.Error as e:
-            logger.error(f"Error getting cloned bots by owner: {e}")
-            return []
-        finally:
-            conn.close()
+            logger.error("Error getting error count: %s", e)
+            return 0
 
-    def delete_cloned_bot(self, bot_id: int) -> bool:
-        """Delete a cloned bot configuration"""
+    def get_recent_errors(self, limit: int = 10) -> List[sqlite3.Row]:
+        """Get recent errors"""
+        self.flush_errors()
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("DELETE FROM cloned_bots WHERE id = ?", (bot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+            cursor = conn.execute("""
+                SELECT * FROM error_log 
+                ORDER BY timestamp DESC LIMIT ?
+            """, (limit,))
+            return cursor.fetchall()
         except sqlite3.Error as e:
-            logger.error(f"Error deleting cloned bot: {e}")
-            return False
-        finally:
-            conn.close()
+            logger.error("Error getting recent errors: %s", e)
+            return []
+
+    # --- Async wrappers: run the blocking calls in a worker thread so the event loop keeps running ---
+
+    async def add_forwarded_message_async(
+        self,
+        source_message_id: int,
+        destination_message_id: Optional[int] = None,
+        message_type: str = "unknown",
+        error_message: Optional[str] = None
+    ) -> bool:
+        """Async variant of add_forwarded_message"""
+        return await asyncio.to_thread(
+            self.add_forwarded_message, source_message_id, destination_message_id, message_type, error_message
+        )
+
+    async def add_forwarded_messages_bulk_async(self, rows: List[Tuple[int, Optional[int], str, Optional[str]]]) -> bool:
+        """Async variant of add_forwarded_messages_bulk"""
+        return await asyncio.to_thread(self.add_forwarded_messages_bulk, rows)
+
+    async def log_error_async(
+        self,
+        error_type: str,
+        error_message: str,
+        source_message_id: Optional[int] = None
+    ) -> bool:
+        """Async variant of log_error"""
+        if self.buffer_errors:
+            return self.log_error(error_type, error_message, source_message_id)
+        return await asyncio.to_thread(self.log_error, error_type, error_message, source_message_id)
+
+    async def is_message_forwarded_async(self, source_message_id: int) -> bool:
+        """Async variant of is_message_forwarded; only the first call touches the database"""
+        if self._forwarded_ids is not None:
+            return source_message_id in self._forwarded_ids
+        return await asyncio.to_thread(self.is_message_forwarded, source_message_id)
+
+    async def get_forwarded_count_async(self) -> int:
+        """Async variant of get_forwarded_count; only the first call touches the database"""
+        if self._forwarded_count is not None:
+            return self._forwarded_count
+        return await asyncio.to_thread(self.get_forwarded_count)
+
+    async def get_error_count_async(self) -> int:
+        """Async variant of get_error_count; only the first call touches the database"""
+        if self._error_count is not None:
+            return self._error_count
+        return await asyncio.to_thread(self.get_error_count)
+
+    async def flush_errors_async(self) -> bool:
+        """Async variant of flush_errors"""
+        return await asyncio.to_thread(self.flush_errors)
+
+    async def get_state_async(self, key: str) -> Optional[str]:
+        """Async variant of get_state; only the first call touches the database"""
+        if self._state is not None:
+            return self._state.get(key)
+        return await asyncio.to_thread(self.get_state, key)
+
+    async def set_state_async(self, key: str, value: str) -> bool:
+        """Async variant of set_state"""
+        return await asyncio.to_thread(self.set_state, key, value)
+
+    async def get_forwarding_progress_async(self) -> Optional[dict]:
+        """Async variant of get_forwarding_progress"""
+        return await asyncio.to_thread(self.get_forwarding_progress)
+
+    async def update_forwarding_progress_async(
+        self,
+        last_forwarded_message_id: int,
+        total_messages_forwarded: int,
+        historical_forwarding_complete: bool = False
+    ) -> bool:
+        """Async variant of update_forwarding_progress"""
+        return await asyncio.to_thread(
+            self.update_forwarding_progress,
+            last_forwarded_message_id, total_messages_forwarded, historical_forwarding_complete
+        )
+
+    async def get_recent_errors_async(self, limit: int = 10) -> List[sqlite3.Row]:
+        """Async variant of get_recent_errors"""
+        return await asyncio.to_thread(self.get_recent_errors, limit)
+
+    async def analyze_async(self) -> bool:
+        """Async variant of analyze"""
+        return await asyncio.to_thread(self.analyze)
@@ -5,22 +5,38 @@ It reads its configuration from the main database using the provided bot token.
 """
 
 import logging
+import logging.handlers
+import queue
 import asyncio
-import time
+import signal
 import sys
 import base64
+import secrets
 import os
 from typing import Optional
 from telegram import Update
-from telegram.ext import Application, ContextTypes, MessageHandler, filters, CommandHandler
+from telegram.ext import Application, ContextTypes, ExtBot, MessageHandler, filters, CommandHandler
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 from config import (
     DELAY_PER_MESSAGE,
+    FORWARD_BATCH_SIZE,
+    FORWARD_BATCH_WAIT_SECONDS,
+    QUEUE_MAX,
+    DB_WRITE_BATCH_SIZE,
+    DB_WRITE_BATCH_WAIT_SECONDS,
+    DB_WRITE_QUEUE_MAX,
+    ERROR_FLUSH_INTERVAL_SECONDS,
     FORWARD_REAL_TIME_MESSAGES,
     LOG_LEVEL,
     LOG_FILE,
     REQUEST_TIMEOUT,
+    POLL_TIMEOUT,
     CONNECT_TIMEOUT,
+    CONNECTION_POOL_SIZE,
+    HTTP_VERSION,
+    WEBHOOK_URL,
+    WEBHOOK_INTERNAL_PORT,
     DATABASE_PATH,
     OWNER_ID,
     TELETHON_API_ID,
@@ -28,18 +44,28 @@ from config import (
     TELETHON_SESSION_FILE,
     TELETHON_SESSION_BASE64
 )
-from database import Database
+from database import Database, finish_on_cancel
 from history_handler import HistoryHandler
-
-# Configure logging
+from message_types import classify_message
+
+# Configure logging: records go through a queue to a listener thread that owns the file and stream
+# handlers, so log writes never block the event loop
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler(LOG_FILE),
+    logging.StreamHandler()
+]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+log_queue = queue.SimpleQueue()
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Final formatting happens in the listener
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler]
 )
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
 logger = logging.getLogger(__name__)
 
 
@@ -54,7 +80,7 @@ class ForwarderBotCore:
         # Use a unique database path for each bot instance to prevent conflicts
         # We'll use the bot token to generate a unique DB file name
         bot_db_path = f"forwarder_bot_{self.config['id']}.db"
-        self.db = Database(db_path=bot_db_path)
+        self.db = Database(db_path=bot_db_path, buffer_errors=True)
         
                 # Decode and save the session file if available (Owner only)
         if TELETHON_SESSION_BASE64:
@@ -69,14 +95,23 @@ class ForwarderBotCore:
                 if os.path.exists(TELETHON_SESSION_FILE):
                     os.remove(TELETHON_SESSION_FILE)
 
-        self.history_handler = HistoryHandler(self.db)
         self.application = None
-        self.last_forward_time = 0
-        self.message_queue = asyncio.Queue()
+        self.message_queue = asyncio.Queue(maxsize=QUEUE_MAX)
+        self.forward_task: Optional[asyncio.Task] = None
+        self.write_queue = asyncio.Queue(maxsize=DB_WRITE_QUEUE_MAX)
+        self.writer_task: Optional[asyncio.Task] = None
+        self.error_flush_task: Optional[asyncio.Task] = None
+        self.history_task: Optional[asyncio.Task] = None
         
         # Extract specific config values
         self.SOURCE_CHANNEL_ID = int(self.config['source_channel_id'])
         self.DESTINATION_CHANNEL_ID = int(self.config['destination_channel_id'])
+        self.history_handler = HistoryHandler(
+            self.db,
+            self.SOURCE_CHANNEL_ID,
+            self.DESTINATION_CHANNEL_ID,
+            owner_chat_id=self.config['owner_chat_id']
+        )
         
         # Log configuration for this instance
         logger.info(f"Instance {self.config['id']} initialized. Source: {self.SOURCE_CHANNEL_ID}, Dest: {self.DESTINATION_CHANNEL_ID}")
@@ -86,26 +121,59 @@ class ForwarderBotCore:
         logger.info(f"Starting Forwarder Bot Instance {self.config['id']}...")
 
         # Create the Application
-        self.application = Application.builder().token(self.bot_token).build()
+        # Pooled connections for API calls; getUpdates gets its own so a long poll never holds up a forward
+        bot = ExtBot(
+            self.bot_token,
+            request=HTTPXRequest(
+                connection_pool_size=CONNECTION_POOL_SIZE,
+                connect_timeout=CONNECT_TIMEOUT,
+                read_timeout=REQUEST_TIMEOUT,
+                http_version=HTTP_VERSION,
+            ),
+            get_updates_request=HTTPXRequest(
+                connect_timeout=CONNECT_TIMEOUT,
+                http_version=HTTP_VERSION,
+            ),
+        )
+        self.application = Application.builder().bot(bot).build()
+        # Historical forwarding sends through this bot and its pooled connections instead of building its own
+        self.history_handler.application = self.application
 
         # Add handlers (Note: these commands are for the *forwarding* bot, not the *manager* bot)
         self.application.add_handler(CommandHandler("start", self.start_command))
         self.application.add_handler(CommandHandler("status", self.status_command))
         self.application.add_handler(CommandHandler("stats", self.stats_command))
-        self.application.add_handler(
-            MessageHandler(filters.Chat(self.SOURCE_CHANNEL_ID), self.handle_message)
-        )
+        if FORWARD_REAL_TIME_MESSAGES:
+            # Service messages (joins, pins, title changes) are never forwarded, so they are filtered before dispatch
+            self.application.add_handler(
+                MessageHandler(filters.Chat(self.SOURCE_CHANNEL_ID) & ~filters.StatusUpdate.ALL, self.handle_message)
+            )
+        else:
+            logger.info(f"Instance {self.config['id']} real-time forwarding is disabled")
 
         # Start the bot
         await self.application.initialize()
         await self.application.start()
-        await self.application.updater.start_polling(
-            allowed_updates=Update.ALL_TYPES,
-            timeout=REQUEST_TIMEOUT,
-            connect_timeout=CONNECT_TIMEOUT,
-        )
-
-        logger.info(f"Instance {self.config['id']} started successfully and is polling for updates")
+        if WEBHOOK_URL:
+            # Telegram pushes updates to us, so there is no polling loop while the channel is idle. The
+            # manager receives them on PORT and relays them here (see BotManager.start_webhook_router); a
+            # fresh secret token per start lets this instance reject updates that did not come from Telegram
+            await self.application.updater.start_webhook(
+                listen="127.0.0.1",
+                port=WEBHOOK_INTERNAL_PORT + self.config['id'],
+                url_path=str(self.config['id']),
+                webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{self.config['id']}",
+                secret_token=secrets.token_urlsafe(32),
+                allowed_updates=Update.ALL_TYPES,
+            )
+            logger.info(f"Instance {self.config['id']} started successfully and is receiving updates via webhook")
+        else:
+            await self.application.updater.start_polling(
+                allowed_updates=Update.ALL_TYPES,
+                timeout=POLL_TIMEOUT,
+                connect_timeout=CONNECT_TIMEOUT,
+            )
+            logger.info(f"Instance {self.config['id']} started successfully and is polling for updates")
 
         # Send a startup confirmation message to the destination channel
         try:
@@ -122,17 +190,31 @@ class ForwarderBotCore:
             # This is a critical error, as it means the bot cannot post to the destination channel.
             # The process should continue, but the user is alerted via the log.
 
+        # Start the batching forwarder that drains the message queue and the task that records its results
+        self.forward_task = asyncio.create_task(self._forward_batcher())
+        self.writer_task = asyncio.create_task(self._db_writer())
+        self.error_flush_task = asyncio.create_task(self._error_flusher())
+
         # Start historical message forwarding in background
-        if not self.db.get_state("historical_forwarding_complete"):
-            asyncio.create_task(self.history_handler.forward_historical_messages())
+        if not await self.db.get_state_async("historical_forwarding_complete"):
+            self.history_task = asyncio.create_task(self.history_handler.forward_historical_messages())
 
     async def stop(self):
         """Stop the bot"""
         logger.info(f"Stopping instance {self.config['id']}...")
+        # Cancel the background tasks one by one and let each write or send what it already holds;
+        # the forwarders go first since they still use the application and queue records for the writer
+        for task in (self.forward_task, self.history_task, self.writer_task, self.error_flush_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
         if self.application:
             await self.application.updater.stop()
             await self.application.stop()
             await self.application.shutdown()
+        self.flush_writes()
+        self.db.flush_errors()
+        self.db.close()
         logger.info(f"Instance {self.config['id']} stopped")
 
     # --- Command Handlers (Simplified for Core Bot) ---
@@ -147,10 +229,10 @@ class ForwarderBotCore:
 
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command"""
-        forwarded_count = self.db.get_forwarded_count()
-        error_count = self.db.get_error_count()
-        progress = self.db.get_forwarding_progress()
-        historical_complete = self.db.get_state("historical_forwarding_complete") == "true"
+        forwarded_count = await self.db.get_forwarded_count_async()
+        error_count = await self.db.get_error_count_async()
+        progress = await self.db.get_forwarding_progress_async()
+        historical_complete = await self.db.get_state_async("historical_forwarding_complete") == "true"
 
         status_message = (
             f"✅ Bot Status: Running (Instance {self.config['id']})\n\n"
@@ -168,9 +250,9 @@ class ForwarderBotCore:
 
     async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /stats command"""
-        forwarded_count = self.db.get_forwarded_count()
-        error_count = self.db.get_error_count()
-        recent_errors = self.db.get_recent_errors(5)
+        forwarded_count = await self.db.get_forwarded_count_async()
+        error_count = await self.db.get_error_count_async()
+        recent_errors = await self.db.get_recent_errors_async(5)
 
         stats_message = (
             f"📊 Forwarding Statistics (Instance {self.config['id']})\n\n"
@@ -189,179 +271,178 @@ class ForwarderBotCore:
 
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle incoming messages from the source channel"""
-        if not FORWARD_REAL_TIME_MESSAGES:
-            logger.debug("Real-time forwarding is disabled")
-            return
-
         try:
             message = update.message
-            
-            # Skip if message is from the bot itself
-            if message.from_user and message.from_user.is_bot:
-                logger.debug("Skipping message from bot")
-                return
 
             # Check if message was already forwarded
-            if self.db.is_message_forwarded(message.message_id):
-                logger.debug(f"Message {message.message_id} already forwarded")
+            if await self.db.is_message_forwarded_async(message.message_id):
+                logger.debug("Message %s already forwarded", message.message_id)
                 return
 
-            # Apply rate limiting
-            await self.apply_rate_limit()
+            # Classify once and pass the type down to the forward/record path
+            message_type = classify_message(message)
 
-            # Forward the message
-            await self.forward_message(message)
+            # Queue the message for the batching forwarder
+            await self.enqueue_message(message, message_type)
 
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
             if update.message:
-                self.db.log_error("MESSAGE_HANDLING_ERROR", str(e), update.message.message_id)
+                await self.db.log_error_async("MESSAGE_HANDLING_ERROR", str(e), update.message.message_id)
 
-    async def forward_message(self, message):
+    async def forward_message(self, message, message_type: Optional[str]):
         """Forward a single message to the destination channel"""
         try:
-            # Determine message type and forward accordingly
-            if message.text:
-                forwarded = await self.application.bot.send_message(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    text=message.text,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "text"
-
-            elif message.photo:
-                forwarded = await self.application.bot.send_photo(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    photo=message.photo[-1].file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "photo"
-
-            elif message.video:
-                forwarded = await self.application.bot.send_video(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    video=message.video.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "video"
-
-            elif message.animation:
-                forwarded = await self.application.bot.send_animation(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    animation=message.animation.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "animation"
-
-            elif message.document:
-                forwarded = await self.application.bot.send_document(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    document=message.document.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "document"
-
-            elif message.audio:
-                forwarded = await self.application.bot.send_audio(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    audio=message.audio.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "audio"
-
-            elif message.voice:
-                forwarded = await self.application.bot.send_voice(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    voice=message.voice.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "voice"
-
-            elif message.sticker:
-                forwarded = await self.application.bot.send_sticker(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    sticker=message.sticker.file_id,
-                )
-                message_type = "sticker"
-
-            elif message.location:
-                forwarded = await self.application.bot.send_location(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    latitude=message.location.latitude,
-                    longitude=message.location.longitude,
-                )
-                message_type = "location"
-
-            elif message.contact:
-                forwarded = await self.application.bot.send_contact(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    phone_number=message.contact.phone_number,
-                    first_name=message.contact.first_name,
-                    last_name=message.contact.last_name,
-                )
-                message_type = "contact"
-
-            elif message.poll:
-                forwarded = await self.application.bot.send_poll(
-                    chat_id=self.DESTINATION_CHANNEL_ID,
-                    question=message.poll.question,
-                    options=[opt.text for opt in message.poll.options],
-                    is_anonymous=message.poll.is_anonymous,
-                    type=message.poll.type,
-                )
-                message_type = "poll"
-
-            else:
-                logger.warning(f"Unsupported message type for message {message.message_id}")
-                self.db.add_forwarded_message(
-                    message.message_id,
-                    error_message="Unsupported message type"
-                )
-                return
+            # Telegram copies the message server-side, keeping media, captions and formatting entities,
+            # the same way forward_batch does for whole batches; the type only labels the record, so
+            # messages classify_message does not know (video notes, dice, venues, ...) are copied too
+            forwarded = await self.application.bot.copy_message(
+                chat_id=self.DESTINATION_CHANNEL_ID,
+                from_chat_id=self.SOURCE_CHANNEL_ID,
+                message_id=message.message_id,
+            )
 
             # Record the forwarded message
-            self.db.add_forwarded_message(
-                message.message_id,
-                forwarded.message_id,
-                message_type
-            )
+            await self.record_forwarded(message.message_id, forwarded.message_id, message_type or "unknown")
 
-            logger.info(f"Instance {self.config['id']} forwarded message {message.message_id} ({message_type})")
+            logger.info("Instance %s forwarded message %s (%s)", self.config['id'], message.message_id, message_type)
 
         except TelegramError as e:
-            logger.error(f"Instance {self.config['id']} Telegram error forwarding message {message.message_id}: {e}")
-            self.db.log_error("TELEGRAM_ERROR", str(e), message.message_id)
-            self.db.add_forwarded_message(
-                message.message_id,
-                error_message=str(e)
-            )
+            logger.error("Instance %s Telegram error forwarding message %s: %s", self.config['id'], message.message_id, e)
+            await self.db.log_error_async("TELEGRAM_ERROR", str(e), message.message_id)
+            await self.record_forwarded(message.message_id, error_message=str(e))
 
         except Exception as e:
-            logger.error(f"Instance {self.config['id']} error forwarding message {message.message_id}: {e}")
-            self.db.log_error("FORWARD_ERROR", str(e), message.message_id)
-            self.db.add_forwarded_message(
-                message.message_id,
-                error_message=str(e)
-            )
+            logger.error("Instance %s error forwarding message %s: %s", self.config['id'], message.message_id, e)
+            await self.db.log_error_async("FORWARD_ERROR", str(e), message.message_id)
+            await self.record_forwarded(message.message_id, error_message=str(e))
 
-    async def apply_rate_limit(self):
-        """Apply rate limiting between messages"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_forward_time
+    async def enqueue_message(self, message, message_type: Optional[str]):
+        """Queue a message for forwarding, dropping the oldest pending message when the queue is full"""
+        try:
+            self.message_queue.put_nowait((message, message_type))
+        except asyncio.QueueFull:
+            dropped, _ = self.message_queue.get_nowait()
+            self.message_queue.put_nowait((message, message_type))
+            logger.warning("Instance %s queue full, dropping message %s", self.config['id'], dropped.message_id)
+            await self.db.log_error_async("QUEUE_FULL", f"Queue limit {QUEUE_MAX} reached, dropped oldest message", dropped.message_id)
+
+    async def record_forwarded(
+        self,
+        source_message_id: int,
+        destination_message_id: Optional[int] = None,
+        message_type: str = "unknown",
+        error_message: Optional[str] = None
+    ):
+        """Queue a forwarded-message record for the background writer"""
+        row = (source_message_id, destination_message_id, message_type, error_message)
+        try:
+            self.write_queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("Instance %s write queue full, recording message %s directly", self.config['id'], source_message_id)
+            await self.db.add_forwarded_messages_bulk_async([row])
+
+    def flush_writes(self):
+        """Write any records still waiting in the write queue"""
+        rows = []
+        while not self.write_queue.empty():
+            rows.append(self.write_queue.get_nowait())
+        if rows:
+            self.db.add_forwarded_messages_bulk(rows)
+
+    async def _db_writer(self):
+        """Background task persisting queued forwarded-message records in batches"""
+        rows: list = []
+        try:
+            while True:
+                await self._drain_queue(self.write_queue, rows, DB_WRITE_BATCH_SIZE, DB_WRITE_BATCH_WAIT_SECONDS)
+                batch, rows = rows, []
+                await finish_on_cancel(self.db.add_forwarded_messages_bulk_async(batch))
+        finally:
+            # Rows already taken off the queue when the writer is cancelled are written before it exits
+            if rows:
+                self.db.add_forwarded_messages_bulk(rows)
+
+    async def _error_flusher(self):
+        """Background task writing buffered errors to the database"""
+        while True:
+            await asyncio.sleep(ERROR_FLUSH_INTERVAL_SECONDS)
+            await finish_on_cancel(self.db.flush_errors_async())
+
+    async def _drain_queue(self, queue: asyncio.Queue, batch: list, max_size: int, max_wait: float):
+        """Wait for a queued item, then collect more until the batch is full or the wait expires;
+        items go straight into the caller's batch so none are lost if the caller is cancelled"""
+        batch.append(await queue.get())
+        deadline = asyncio.get_running_loop().time() + max_wait
+
+        # asyncio.timeout_at, unlike wait_for on Python 3.11, never swallows a cancellation that
+        # arrives together with a queued item
+        try:
+            async with asyncio.timeout_at(deadline):
+                while len(batch) < max_size:
+                    batch.append(await queue.get())
+        except TimeoutError:
+            pass
+
+    async def _forward_batcher(self):
+        """Background task forwarding queued messages in batches"""
+        batch: list = []
+        try:
+            while True:
+                await self._drain_queue(self.message_queue, batch, FORWARD_BATCH_SIZE, FORWARD_BATCH_WAIT_SECONDS)
+                sent, batch = batch, []
+                await finish_on_cancel(self._send_batch(sent))
+
+                # Rate limiting: spend the per-message delay budget of the whole batch between flushes
+                # (skipped entirely when rate limiting is configured off)
+                if DELAY_PER_MESSAGE > 0:
+                    await asyncio.sleep(len(sent) * DELAY_PER_MESSAGE)
+        finally:
+            # Messages already taken off the queue when the batcher is cancelled are sent before it exits
+            if batch:
+                await self._send_batch(batch)
+
+    async def _send_batch(self, batch: list):
+        """Forward a batch, logging any error so the batcher keeps running"""
+        try:
+            await self.forward_batch(batch)
+        except Exception as e:
+            logger.error("Instance %s error forwarding batch: %s", self.config['id'], e)
+            await self.db.log_error_async("FORWARD_ERROR", str(e))
+
+    async def forward_batch(self, batch: list):
+        """Forward a batch of (message, message_type) pairs with a single copy_messages call"""
+        batch.sort(key=lambda item: item[0].message_id)
+        message_ids = [message.message_id for message, _ in batch]
+
+        try:
+            # copy_messages republishes without the "Forwarded from" header, matching the per-message fallback
+            forwarded = await self.application.bot.copy_messages(
+                chat_id=self.DESTINATION_CHANNEL_ID,
+                from_chat_id=self.SOURCE_CHANNEL_ID,
+                message_ids=message_ids,
+            )
+        except TelegramError as e:
+            # Fall back to forwarding one by one so a single bad message does not fail the batch
+            logger.warning("Instance %s batch forward failed, forwarding individually: %s", self.config['id'], e)
+            for message, message_type in batch:
+                await self.forward_message(message, message_type)
+            return
 
-        if time_since_last < DELAY_PER_MESSAGE:
-            wait_time = DELAY_PER_MESSAGE - time_since_last
-            logger.debug(f"Rate limiting: waiting {wait_time:.2f} seconds")
-            await asyncio.sleep(wait_time)
+        if len(forwarded) != len(batch):
+            # Telegram omits messages it could not copy without saying which, so the copies cannot be paired
+            # with their sources; each message is recorded as an error rather than as a success without a copy
+            error = f"copy_messages copied {len(forwarded)} of {len(batch)} messages in the batch; the copied ones are unknown"
+            logger.warning("Instance %s %s", self.config['id'], error)
+            for message, message_type in batch:
+                await self.db.log_error_async("PARTIAL_BATCH", error, message.message_id)
+                await self.record_forwarded(message.message_id, message_type=message_type or "unknown", error_message=error)
+            return
 
-        self.last_forward_time = time.time()
+        for (message, message_type), copied in zip(batch, forwarded):
+            await self.record_forwarded(message.message_id, copied.message_id, message_type or "unknown")
 
+        logger.info("Instance %s forwarded %d of %d messages", self.config['id'], len(forwarded), len(batch))
 
 async def main():
     """Main entry point for the core forwarder bot instance"""
@@ -386,18 +467,32 @@ async def main():
     bot = ForwarderBotCore(bot_token, config)
     try:
         await bot.start()
-        # Keep the bot running
-        while True:
-            await asyncio.sleep(1)
+        # Keep the bot running until SIGINT or SIGTERM (sent by the manager when it stops a bot)
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+        await stop_event.wait()
+        logger.info("Shutdown signal received")
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
     except Exception as e:
         logger.error(f"Fatal error in core bot: {e}")
     finally:
+        # The status is left to the manager: a shutdown it initiates keeps the bot 'running' so it
+        # comes back on the next start, and an admin stop records 'stopped' itself
         await bot.stop()
-        # Update the status to 'stopped' in the main database
-        main_db.update_cloned_bot_status(config['id'], 'stopped')
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional; when installed it replaces the default event loop for lower per-call overhead
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    try:
+        asyncio.run(main())
+    finally:
+        # Flush queued log records before the process exits
+        log_listener.stop()
@@ -7,17 +7,16 @@ Implements rate limiting: 50 messages per 20 minutes
 import logging
 import asyncio
 import time
-from typing import Optional, List
-from telegram import Chat, Message
+from typing import Optional, List, Tuple
 from telegram.ext import Application
-from telegram.error import TelegramError
+from telegram.error import RetryAfter, TelegramError
 from config import (
     BOT_TOKEN,
-    SOURCE_CHANNEL_ID,
-    DESTINATION_CHANNEL_ID,
     MESSAGES_PER_BATCH,
-    BATCH_INTERVAL_SECONDS,
     DELAY_PER_MESSAGE,
+    PROGRESS_FLUSH_INTERVAL_SECONDS,
+    PROGRESS_FLUSH_MESSAGES,
+    HISTORY_RECORD_BATCH_SIZE,
     REQUEST_TIMEOUT,
     CONNECT_TIMEOUT,
     OWNER_ID,
@@ -25,7 +24,8 @@ from config import (
     TELETHON_API_HASH,
     TELETHON_SESSION_FILE
 )
-from database import Database
+from database import Database, finish_on_cancel
+from message_types import classify_telethon_message
 
 logger = logging.getLogger(__name__)
 
@@ -33,14 +33,23 @@ logger = logging.getLogger(__name__)
 class HistoryHandler:
     """Handles historical message forwarding with rate limiting"""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, source_channel_id: int, destination_channel_id: int,
+                 application: Optional[Application] = None, owner_chat_id: Optional[int] = None):
         """Initialize the history handler"""
         self.db = db
-        self.application = None
+        # The running bot's own channels, so every clone forwards its history between its configured chats
+        self.source_channel_id = source_channel_id
+        self.destination_channel_id = destination_channel_id
+        # Only the owner's bots can use the owner's Telethon session; decided once from the bot's config
+        self.is_owner_bot = owner_chat_id is not None and owner_chat_id == OWNER_ID
+        # The running bot's Application, so historical sends share its HTTP connection pool
+        self.application = application
         self.forwarding_in_progress = False
+        # Forwarded-message rows waiting to be written with one bulk insert
+        self.pending_records: List[tuple] = []
 
     async def initialize_application(self):
-        """Initialize the Telegram application"""
+        """Initialize a standalone Telegram application if none was shared with this handler"""
         if self.application is None:
             self.application = Application.builder().token(BOT_TOKEN).build()
             await self.application.initialize()
@@ -77,273 +86,193 @@ class HistoryHandler:
         logger.info("Starting historical message forwarding...")
 
         try:
-            await self.initialize_application()
-
             # Check if historical forwarding is already complete
-            if self.db.get_state("historical_forwarding_complete") == "true":
+            if await self.db.get_state_async("historical_forwarding_complete") == "true":
                 logger.info("Historical forwarding already complete")
                 return
 
-            self.forwarding_in_progress = True
-            messages_forwarded = 0
-            batch_start_time = time.time()
-            batch_count = 0
-
-            # Get the starting point for historical forwarding
-            progress = self.db.get_forwarding_progress()
-            start_from_id = progress.get('last_forwarded_message_id', 0) if progress else 0
-
-            logger.info(f"Starting historical forwarding from message ID: {start_from_id}")
-
-            # Check if the current bot instance is owned by the owner
-            # Only the owner's bots can use the Telethon feature
-            if self.db.get_cloned_bot_by_token(self.application.bot.token)['owner_chat_id'] != OWNER_ID:
+            # Check if the current bot instance is owned by the owner before setting anything up
+            if not self.is_owner_bot:
                 logger.info("Bot is not owned by the owner. Skipping Telethon historical forwarding.")
-                self.db.set_state("historical_forwarding_complete", "true")
+                await self.db.set_state_async("historical_forwarding_complete", "true")
                 return
 
+            await self.initialize_application()
+
             client = await self._get_telethon_client()
             if not client:
-                self.db.set_state("historical_forwarding_complete", "true")
+                await self.db.set_state_async("historical_forwarding_complete", "true")
                 return
 
+            self.forwarding_in_progress = True
+            messages_forwarded = 0
+
             # Get the starting point for historical forwarding
-            progress = self.db.get_forwarding_progress()
+            progress = await self.db.get_forwarding_progress_async()
             last_forwarded_id = progress.get('last_forwarded_message_id', 0) if progress else 0
-            
+
             # Use Telethon to fetch messages
             logger.info(f"Starting Telethon historical forwarding from message ID: {last_forwarded_id}")
             
-            # Telethon's get_messages returns newest first, so we reverse it to process chronologically
-            messages = []
+            # Progress is persisted on a time or message delta rather than per message;
+            # anything lost on a crash is caught again by the is_message_forwarded check
+            last_persisted = messages_forwarded
+            last_progress_ts = time.monotonic()
+
+            # Messages are forwarded in chunks with one forward_messages call each (the Bot API takes up
+            # to 100 IDs); after a chunk, the next one waits out that chunk's share of the rate limit
+            chunk_size = min(100, MESSAGES_PER_BATCH)
+            chunk: List[Tuple[int, Optional[str]]] = []
+            next_send_at = time.monotonic()
+
+            # Process messages chronologically (reverse=True) as Telethon fetches them page by page,
+            # so memory stays flat and forwarding starts without waiting for the whole history
             async for message in client.iter_messages(
-                SOURCE_CHANNEL_ID, 
+                self.source_channel_id, 
                 min_id=last_forwarded_id, 
                 reverse=True
             ):
-                messages.append(message)
-
-            # Process messages chronologically
-            for message in messages:
-                # Convert Telethon message to a format usable by the Bot API (or re-implement forwarding)
-                # For simplicity, we will use the Bot API's forward_message method if possible
-                # NOTE: The Bot API's forward_message requires the message to be visible to the bot,
-                # which is not guaranteed for old messages. A full implementation would require
-                # re-implementing the forwarding logic using Telethon's send_message methods.
-                
-                # For now, we will use the Bot API's forward_message method as a best-effort attempt.
-                # A proper solution would require a full Telethon-based forwarding implementation.
-                
-                # We will use the Bot API's forward_message method as a best-effort attempt.
-                try:
-                    await self.application.bot.forward_message(
-                        chat_id=DESTINATION_CHANNEL_ID,
-                        from_chat_id=SOURCE_CHANNEL_ID,
-                        message_id=message.id
-                    )
-                    messages_forwarded += 1
-                    self.db.update_forwarding_progress(message.id, messages_forwarded)
-                    
-                    # Apply rate limiting
-                    success, batch_count, batch_start_time = await self.forward_message_with_rate_limit(
-                        message, batch_start_time, batch_count
-                    )
-                    
-                    if not success:
-                        logger.warning(f"Rate limit exceeded or forwarding failed for message {message.id}. Stopping batch.")
-                        break
-                        
-                except TelegramError as e:
-                    logger.error(f"Bot API forward failed for historical message {message.id}: {e}")
-                    # Log error and continue to the next message
-                    self.db.log_error("HISTORY_FORWARDING_ERROR", str(e), message.id)
-                    
+                # Service messages (channel created, pins, title changes) cannot be forwarded, and a chunk
+                # holding one comes back short; every channel starts with one
+                if message.action is not None:
+                    continue
+                if await self.db.is_message_forwarded_async(message.id):
+                    continue
+                chunk.append((message.id, classify_telethon_message(message)))
+                if len(chunk) < chunk_size:
+                    continue
+
+                next_send_at = await self._wait_until(next_send_at)
+                # A chunk already handed to Telegram is finished and recorded even if the task is cancelled,
+                # so it is not sent again on the next start
+                messages_forwarded += await finish_on_cancel(self.forward_chunk(chunk))
+                next_send_at += len(chunk) * DELAY_PER_MESSAGE
+                last_forwarded_id = chunk[-1][0]
+                chunk = []
+
+                if (messages_forwarded - last_persisted >= PROGRESS_FLUSH_MESSAGES
+                        or time.monotonic() - last_progress_ts > PROGRESS_FLUSH_INTERVAL_SECONDS):
+                    # Write the records first so persisted progress never runs ahead of them
+                    await self.flush_records()
+                    await finish_on_cancel(self.db.update_forwarding_progress_async(last_forwarded_id, messages_forwarded))
+                    last_persisted = messages_forwarded
+                    last_progress_ts = time.monotonic()
+
+            if chunk:
+                await self._wait_until(next_send_at)
+                messages_forwarded += await finish_on_cancel(self.forward_chunk(chunk))
+
             await client.disconnect()
+            await self.flush_records()
             
             # Mark historical forwarding as complete
-            self.db.set_state("historical_forwarding_complete", "true")
-            self.db.update_forwarding_progress(0, messages_forwarded, True)
+            await finish_on_cancel(self.db.set_state_async("historical_forwarding_complete", "true"))
+            await finish_on_cancel(self.db.update_forwarding_progress_async(0, messages_forwarded, True))
+            # The backfill just bulk-loaded forwarded_messages; refresh planner statistics
+            await finish_on_cancel(self.db.analyze_async())
 
             logger.info(f"Historical message forwarding completed. Total forwarded: {messages_forwarded}")
             self.forwarding_in_progress = False
 
+        except asyncio.CancelledError:
+            logger.info("Historical message forwarding stopped")
+            await self.flush_records()
+            self.forwarding_in_progress = False
+            raise
+
         except Exception as e:
             logger.error(f"Error in historical message forwarding: {e}")
-            self.db.log_error("HISTORY_FORWARDING_ERROR", str(e))
+            await self.db.log_error_async("HISTORY_FORWARDING_ERROR", str(e))
+            await self.flush_records()
             self.forwarding_in_progress = False
 
-    async def forward_message_with_rate_limit(self, message: Message, batch_start_time: float, batch_count: int) -> tuple:
-        """
-        Forward a single message with rate limiting
-        Returns: (success: bool, new_batch_count: int, new_batch_start_time: float)
-        """
-        try:
-            # Check if we need to wait for the next batch
-            current_time = time.time()
-            elapsed = current_time - batch_start_time
-
-            if batch_count >= MESSAGES_PER_BATCH:
-                # We've reached the batch limit, wait for the interval
-                remaining_wait = BATCH_INTERVAL_SECONDS - elapsed
-                if remaining_wait > 0:
-                    logger.info(f"Batch limit reached. Waiting {remaining_wait:.2f} seconds before next batch...")
-                    await asyncio.sleep(remaining_wait)
-                
-                # Reset for new batch
-                batch_start_time = time.time()
-                batch_count = 0
-
-            # Apply per-message delay
-            if batch_count > 0:
-                await asyncio.sleep(DELAY_PER_MESSAGE)
-
-            # Forward the message
-            await self._forward_single_message(message)
-            batch_count += 1
-
-            return True, batch_count, batch_start_time
-
-        except Exception as e:
-            logger.error(f"Error forwarding historical message {message.message_id}: {e}")
-            return False, batch_count, batch_start_time
+    async def _wait_until(self, deadline: float) -> float:
+        """Sleep until the monotonic deadline, returning the time sending may resume"""
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return time.monotonic()
+
+    async def _call_with_retry(self, method, **kwargs):
+        """Call a Bot API method, waiting out flood-control (RetryAfter) responses for as long as Telegram asks"""
+        while True:
+            try:
+                return await method(**kwargs)
+            except RetryAfter as e:
+                logger.warning("Flood control exceeded, retrying in %s seconds", e.retry_after)
+                await asyncio.sleep(e.retry_after)
+
+    async def forward_chunk(self, chunk: List[Tuple[int, Optional[str]]]) -> int:
+        """Forward (message_id, message_type) pairs with one forward_messages call; returns how many were forwarded"""
+        message_ids = [message_id for message_id, _ in chunk]
 
-    async def _forward_single_message(self, message: Message):
-        """Forward a single message to the destination channel"""
         try:
-            # Check if already forwarded
-            if self.db.is_message_forwarded(message.message_id):
-                logger.debug(f"Message {message.message_id} already forwarded")
-                return
-
-            # Determine message type and forward accordingly
-            if message.text:
-                forwarded = await self.application.bot.send_message(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    text=message.text,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "text"
-
-            elif message.photo:
-                forwarded = await self.application.bot.send_photo(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    photo=message.photo[-1].file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "photo"
-
-            elif message.video:
-                forwarded = await self.application.bot.send_video(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    video=message.video.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "video"
-
-            elif message.animation:
-                forwarded = await self.application.bot.send_animation(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    animation=message.animation.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "animation"
-
-            elif message.document:
-                forwarded = await self.application.bot.send_document(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    document=message.document.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "document"
-
-            elif message.audio:
-                forwarded = await self.application.bot.send_audio(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    audio=message.audio.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "audio"
-
-            elif message.voice:
-                forwarded = await self.application.bot.send_voice(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    voice=message.voice.file_id,
-                    caption=message.caption,
-                    parse_mode=message.parse_mode,
-                )
-                message_type = "voice"
-
-            elif message.sticker:
-                forwarded = await self.application.bot.send_sticker(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    sticker=message.sticker.file_id,
-                )
-                message_type = "sticker"
-
-            elif message.location:
-                forwarded = await self.application.bot.send_location(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    latitude=message.location.latitude,
-                    longitude=message.location.longitude,
-                )
-                message_type = "location"
-
-            elif message.contact:
-                forwarded = await self.application.bot.send_contact(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    phone_number=message.contact.phone_number,
-                    first_name=message.contact.first_name,
-                    last_name=message.contact.last_name,
-                )
-                message_type = "contact"
-
-            elif message.poll:
-                forwarded = await self.application.bot.send_poll(
-                    chat_id=DESTINATION_CHANNEL_ID,
-                    question=message.poll.question,
-                    options=[opt.text for opt in message.poll.options],
-                    is_anonymous=message.poll.is_anonymous,
-                    type=message.poll.type,
-                )
-                message_type = "poll"
-
-            else:
-                logger.warning(f"Unsupported message type for message {message.message_id}")
-                self.db.add_forwarded_message(
-                    message.message_id,
-                    error_message="Unsupported message type"
-                )
-                return
-
-            # Record the forwarded message
-            self.db.add_forwarded_message(
-                message.message_id,
-                forwarded.message_id,
-                message_type
+            forwarded = await self._call_with_retry(
+                self.application.bot.forward_messages,
+                chat_id=self.destination_channel_id,
+                from_chat_id=self.source_channel_id,
+                message_ids=message_ids,
             )
-
-            logger.info(f"Forwarded historical message {message.message_id} ({message_type})")
-
         except TelegramError as e:
-            logger.error(f"Telegram error forwarding message {message.message_id}: {e}")
-            self.db.log_error("TELEGRAM_ERROR", str(e), message.message_id)
-            self.db.add_forwarded_message(
-                message.message_id,
-                error_message=str(e)
-            )
-
-        except Exception as e:
-            logger.error(f"Error forwarding message {message.message_id}: {e}")
-            self.db.log_error("FORWARD_ERROR", str(e), message.message_id)
-            self.db.add_forwarded_message(
-                message.message_id,
-                error_message=str(e)
+            # Fall back to forwarding one by one so a single bad message does not fail the chunk
+            logger.warning("Forwarding %d historical messages failed, forwarding individually: %s", len(chunk), e)
+            return await self._forward_individually(chunk)
+
+        if len(forwarded) != len(chunk):
+            # Telegram omits messages it could not forward without saying which, so the copies cannot be
+            # paired with their sources; forwarding one by one records each message's own result
+            logger.warning("Forwarded only %d of %d historical messages, forwarding individually", len(forwarded), len(chunk))
+            return await self._forward_individually(chunk)
+
+        for (message_id, message_type), copied in zip(chunk, forwarded):
+            await self.record_forwarded(message_id, copied.message_id, message_type or "unknown")
+
+        logger.info("Forwarded %d historical messages", len(chunk))
+        return len(chunk)
+
+    async def _forward_individually(self, chunk: List[Tuple[int, Optional[str]]]) -> int:
+        """Forward each message of a chunk on its own; returns how many were forwarded"""
+        forwarded_count = 0
+        for message_id, message_type in chunk:
+            forwarded_count += await self._forward_single_message(message_id, message_type)
+        return forwarded_count
+
+    async def _forward_single_message(self, message_id: int, message_type: Optional[str]) -> bool:
+        """Forward a single historical message to the destination channel"""
+        try:
+            forwarded = await self._call_with_retry(
+                self.application.bot.forward_message,
+                chat_id=self.destination_channel_id,
+                from_chat_id=self.source_channel_id,
+                message_id=message_id,
             )
+        except TelegramError as e:
+            logger.error("Bot API forward failed for historical message %s: %s", message_id, e)
+            await self.db.log_error_async("HISTORY_FORWARDING_ERROR", str(e), message_id)
+            await self.record_forwarded(message_id, error_message=str(e))
+            return False
+
+        await self.record_forwarded(message_id, forwarded.message_id, message_type or "unknown")
+        return True
+
+    async def record_forwarded(
+        self,
+        source_message_id: int,
+        destination_message_id: Optional[int] = None,
+        message_type: str = "unknown",
+        error_message: Optional[str] = None
+    ):
+        """Buffer a forwarded-message record, writing the buffer once it reaches HISTORY_RECORD_BATCH_SIZE rows"""
+        self.pending_records.append((source_message_id, destination_message_id, message_type, error_message))
+        if len(self.pending_records) >= HISTORY_RECORD_BATCH_SIZE:
+            await self.flush_records()
+
+    async def flush_records(self):
+        """Write buffered forwarded-message records in one transaction"""
+        if self.pending_records:
+            rows, self.pending_records = self.pending_records, []
+            # The rows are already out of the buffer, so the write is finished even if the task is cancelled
+            await finish_on_cancel(self.db.add_forwarded_messages_bulk_async(rows))
 
     def get_forwarding_status(self) -> dict:
         """Get the current status of historical forwarding"""
@@ -8,11 +8,22 @@ Handles the lifecycle of all cloned bot instances:
 
 import logging
 import asyncio
-import subprocess
 import sys
+import time
+from collections import deque
 from typing import List, Dict, Optional
 from database import Database
-from config import DATABASE_PATH
+from config import (
+    DATABASE_PATH,
+    RESTART_BACKOFF_MAX_SECONDS,
+    MAX_RESTART_ATTEMPTS,
+    SPAWN_CONCURRENCY,
+    STDERR_TAIL_LINES,
+    STOP_TIMEOUT_SECONDS,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PORT,
+    WEBHOOK_INTERNAL_PORT
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,123 +32,257 @@ class BotManager:
 
     def __init__(self, db: Database):
         self.db = db
-        # Dictionary to hold running processes: {bot_id: subprocess.Popen}
-        self.running_bots: Dict[int, subprocess.Popen] = {}
-        self.monitor_task: Optional[asyncio.Task] = None
+        # Dictionary to hold running processes: {bot_id: asyncio.subprocess.Process}
+        self.running_bots: Dict[int, asyncio.subprocess.Process] = {}
+        # One supervisor task per running bot, awaiting its process exit: {bot_id: asyncio.Task}
+        self.supervisors: Dict[int, asyncio.Task] = {}
+        # Consecutive failed runs per bot, used for the restart backoff
+        self.restart_attempts: Dict[int, int] = {}
+        # Set by stop_all_bots so no supervisor restarts a bot while the manager shuts down
+        self.shutting_down = False
+        # The HTTP server relaying webhook updates to the forwarders, when WEBHOOK_URL is set
+        self.webhook_server = None
 
-    def start_all_cloned_bots(self):
+    async def start_all_cloned_bots(self):
         """Starts all bots marked as 'running' or 'pending' in the database"""
-        cloned_bots = self.db.get_cloned_bots()
-        logger.info(f"Found {len(cloned_bots)} cloned bot configurations in the database.")
-        
-        for bot_config in cloned_bots:
-            if bot_config['status'] in ['running', 'pending']:
-                self.spawn_bot_process(bot_config)
-
-    def spawn_bot_process(self, bot_config: Dict):
+        cloned_bots = self.db.get_cloned_bots(statuses=('running', 'pending'))
+        logger.info(f"Found {len(cloned_bots)} running or pending cloned bot configurations in the database.")
+
+        to_start = [bot_config for bot_config in cloned_bots if not self.is_running(bot_config['id'])]
+        # Processes are started concurrently, at most SPAWN_CONCURRENCY at a time
+        semaphore = asyncio.Semaphore(SPAWN_CONCURRENCY)
+
+        async def start(bot_config: Dict) -> Optional[asyncio.subprocess.Process]:
+            async with semaphore:
+                return await self.start_process(bot_config)
+
+        processes = await asyncio.gather(*(start(bot_config) for bot_config in to_start))
+
+        # Record every new status and process ID in one transaction
+        self.db.update_cloned_bot_statuses([
+            (bot_config['id'], 'running', process.pid) if process else (bot_config['id'], 'error', None)
+            for bot_config, process in zip(to_start, processes)
+        ])
+
+    async def start_webhook_router(self):
+        """Listens on PORT for every forwarder's webhook and relays each update to its instance by ID"""
+        # tornado comes with python-telegram-bot[webhooks], which webhook mode needs anyway
+        from tornado.httpclient import AsyncHTTPClient
+        from tornado.web import Application, RequestHandler
+
+        manager = self
+        client = AsyncHTTPClient()
+
+        class RelayHandler(RequestHandler):
+            async def post(self, bot_id: str):
+                bot_id = int(bot_id)
+                # A non-2xx answer makes Telegram keep the update and retry it later
+                if not manager.is_running(bot_id):
+                    self.set_status(503)
+                    return
+                # The forwarder checks the secret token itself, so the header is passed through untouched
+                headers = {
+                    name: self.request.headers[name]
+                    for name in ("Content-Type", "X-Telegram-Bot-Api-Secret-Token")
+                    if name in self.request.headers
+                }
+                try:
+                    response = await client.fetch(
+                        f"http://127.0.0.1:{WEBHOOK_INTERNAL_PORT + bot_id}/{bot_id}",
+                        method="POST",
+                        headers=headers,
+                        body=self.request.body,
+                        raise_error=False
+                    )
+                    self.set_status(response.code)
+                except Exception as e:
+                    # The instance may still be starting up and not listening yet
+                    logger.warning(f"Could not relay a webhook update to bot {bot_id}: {e}")
+                    self.set_status(502)
+
+        self.webhook_server = Application([(r"/(\d+)", RelayHandler)]).listen(WEBHOOK_PORT, address=WEBHOOK_LISTEN)
+        logger.info(f"Relaying forwarder webhooks from {WEBHOOK_LISTEN}:{WEBHOOK_PORT}")
+
+    def is_running(self, bot_id: int) -> bool:
+        """Checks whether the bot's process is running"""
+        return bot_id in self.running_bots and self.running_bots[bot_id].returncode is None
+
+    async def spawn_bot_process(self, bot_config: Dict):
         """Spawns a new subprocess for a single bot instance"""
         bot_id = bot_config['id']
-        bot_token = bot_config['bot_token']
-        
-        if bot_id in self.running_bots and self.running_bots[bot_id].poll() is None:
+
+        if self.is_running(bot_id):
             logger.warning(f"Bot {bot_id} is already running. Skipping spawn.")
             return
 
+        process = await self.start_process(bot_config)
+
+        # Update the database with the new process ID and status
+        if process:
+            self.db.update_cloned_bot_status(bot_id, 'running', process.pid)
+        else:
+            self.db.update_cloned_bot_status(bot_id, 'error')
+
+    async def start_process(self, bot_config: Dict) -> Optional[asyncio.subprocess.Process]:
+        """Starts and supervises a bot's process without recording its status; returns None if it failed to start"""
+        bot_id = bot_config['id']
+
         try:
-            # Command to run the core forwarder logic
-            command = [
-                sys.executable,  # Use the same Python interpreter
+            # Start the core forwarder logic with the same Python interpreter,
+            # in the current working directory (telegram-forwarder-bot)
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
                 'forwarder_core.py',
-                bot_token
-            ]
-            
-            # Start the subprocess
-            process = subprocess.Popen(
-                command,
-                cwd='.',  # Current working directory (telegram-forwarder-bot)
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                bot_config['bot_token'],
+                # The forwarder logs to LOG_FILE and stderr itself and prints nothing to stdout
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
             )
-            
-            self.running_bots[bot_id] = process
-            
-            # Update the database with the new process ID and status
-            self.db.update_cloned_bot_status(bot_id, 'running', process.pid)
-            logger.info(f"Successfully spawned bot {bot_id} (PID: {process.pid})")
-
         except Exception as e:
             logger.error(f"Failed to spawn bot {bot_id}: {e}")
+            return None
+
+        self.running_bots[bot_id] = process
+        self.supervisors[bot_id] = asyncio.create_task(self.supervise(bot_id, process, bot_config))
+        logger.info(f"Successfully spawned bot {bot_id} (PID: {process.pid})")
+        return process
+
+    async def supervise(self, bot_id: int, process: asyncio.subprocess.Process, bot_config: Dict):
+        """Waits for a bot process to exit, logs its output and restarts it with exponential backoff"""
+        started_at = time.monotonic()
+        # stderr is read line by line while the bot runs, so a chatty bot cannot fill the pipe and block
+        stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+        await asyncio.gather(self.drain(bot_id, process.stderr, stderr_tail), process.wait())
+        return_code = process.returncode
+
+        # A bot stopped on purpose has already been removed from running_bots
+        if self.running_bots.get(bot_id) is not process:
+            return
+        del self.running_bots[bot_id]
+
+        # Log output for debugging
+        logger.warning(f"Bot {bot_id} (PID: {process.pid}) terminated with code {return_code}.")
+        if return_code != 0 and stderr_tail:
+            logger.error(f"Bot {bot_id} STDERR (last {len(stderr_tail)} lines):\n" + "\n".join(stderr_tail))
+
+        if return_code == 0:
+            # A clean exit means the bot was told to shut down from outside (e.g. along with the container);
+            # its status is left as is so it is started again with the manager
+            self.supervisors.pop(bot_id, None)
+            self.restart_attempts.pop(bot_id, None)
+            return
+
+        # A run that lasted longer than the maximum backoff counts as healthy and resets the backoff
+        if time.monotonic() - started_at > RESTART_BACKOFF_MAX_SECONDS:
+            self.restart_attempts.pop(bot_id, None)
+        attempts = self.restart_attempts.get(bot_id, 0)
+
+        # A bot that keeps crashing right after start (e.g. a revoked token) is given up on
+        if attempts >= MAX_RESTART_ATTEMPTS:
+            logger.error(f"Bot {bot_id} crashed {attempts + 1} times in a row. Marking it as 'error'.")
+            self.supervisors.pop(bot_id, None)
+            self.restart_attempts.pop(bot_id, None)
             self.db.update_cloned_bot_status(bot_id, 'error')
+            return
+
+        self.restart_attempts[bot_id] = attempts + 1
+        delay = min(2 ** attempts, RESTART_BACKOFF_MAX_SECONDS)
 
-    async def monitor_bots(self):
-        """Asynchronously monitors all running bot processes"""
+        # Attempt to restart the bot
+        logger.info(f"Attempting to restart bot {bot_id} in {delay} seconds...")
+        await asyncio.sleep(delay)
+        if not self.shutting_down and bot_id not in self.running_bots:
+            await self.spawn_bot_process(bot_config)
+
+    async def drain(self, bot_id: int, stream: asyncio.StreamReader, tail: deque):
+        """Relays a bot's output line by line as it arrives, keeping the last lines for crash reports"""
         while True:
-            await asyncio.sleep(30)  # Check every 30 seconds
-            
-            bots_to_check = list(self.running_bots.keys())
-            for bot_id in bots_to_check:
-                process = self.running_bots.get(bot_id)
-                if process is None:
-                    continue
-
-                # Check if the process has terminated
-                return_code = process.poll()
-                if return_code is not None:
-                    # Process has terminated
-                    del self.running_bots[bot_id]
-                    
-                    # Read the bot's configuration from the database
-                    bot_config = self.db.get_cloned_bot_by_id(bot_id)
-                    
-                    if bot_config:
-                        # Log output for debugging
-                        stdout, stderr = process.communicate()
-                        logger.warning(f"Bot {bot_id} (PID: {bot_config.get('process_id')}) terminated with code {return_code}.")
-                        logger.debug(f"Bot {bot_id} STDOUT: {stdout}")
-                        logger.error(f"Bot {bot_id} STDERR: {stderr}")
-                        
-                        # Attempt to restart the bot
-                        logger.info(f"Attempting to restart bot {bot_id}...")
-                        self.spawn_bot_process(bot_config)
-                    else:
-                        logger.error(f"Configuration for terminated bot {bot_id} not found in DB.")
-
-    async def start_monitoring(self):
-        """Starts the background monitoring task"""
-        if self.monitor_task is None or self.monitor_task.done():
-            self.monitor_task = asyncio.create_task(self.monitor_bots())
-            logger.info("Bot manager monitoring task started.")
-
-    def stop_all_bots(self):
-        """Terminates all running bot processes"""
-        if self.monitor_task:
-            self.monitor_task.cancel()
-        
-        for bot_id, process in self.running_bots.items():
-            if process.poll() is None:
+            try:
+                line = await stream.readuntil(b'\n')
+            except asyncio.IncompleteReadError as e:
+                # End of output; the last line may lack a trailing newline
+                if not e.partial:
+                    return
+                line = e.partial
+            except asyncio.LimitOverrunError as e:
+                # A line over the reader's 64 KiB limit (e.g. a huge traceback) is relayed in pieces;
+                # readline would raise instead and leave the pipe unread until the bot blocks on it
+                line = await stream.read(e.consumed)
+            line = line.decode(errors='replace').rstrip()
+            tail.append(line)
+            # The bot already writes these lines to LOG_FILE, so they are relayed at debug level only
+            logger.debug(f"Bot {bot_id}: {line}")
+
+    async def stop_all_bots(self):
+        """Terminates all running bot processes on manager shutdown"""
+        self.shutting_down = True
+        if self.webhook_server:
+            self.webhook_server.stop()
+            self.webhook_server = None
+        running, self.running_bots = self.running_bots, {}
+
+        stopped = []
+        for bot_id, process in running.items():
+            if process.returncode is None:
                 try:
                     process.terminate()
-                    self.db.update_cloned_bot_status(bot_id, 'stopped')
+                    stopped.append(process)
                     logger.info(f"Terminated bot {bot_id} (PID: {process.pid})")
                 except Exception as e:
                     logger.error(f"Error terminating bot {bot_id}: {e}")
-        self.running_bots.clear()
+        # Statuses are left as 'running' so every bot is started again when the manager comes back;
+        # only an explicit stop from the admin dashboard records 'stopped'
+
+        # Reap the terminated processes while the event loop is still running; the supervisors keep
+        # draining their output meanwhile and are cancelled only afterwards
+        if stopped:
+            _, pending = await asyncio.wait(
+                [asyncio.create_task(process.wait()) for process in stopped],
+                timeout=STOP_TIMEOUT_SECONDS
+            )
+            if pending:
+                for process in stopped:
+                    if process.returncode is None:
+                        logger.warning(f"Bot process {process.pid} did not exit within {STOP_TIMEOUT_SECONDS} seconds. Killing it.")
+                        process.kill()
+                await asyncio.wait(pending)
+        for supervisor in self.supervisors.values():
+            supervisor.cancel()
+        self.supervisors.clear()
 
-    def stop_bot_by_id(self, bot_id: int) -> bool:
-        """Stops a single bot process by its ID"""
-        process = self.running_bots.get(bot_id)
-        if process and process.poll() is None:
+    async def stop_bot_by_id(self, bot_id: int) -> bool:
+        """Stops a single bot process by its ID and waits for it to exit"""
+        process = self.running_bots.pop(bot_id, None)
+        stopped = False
+        if process and process.returncode is None:
             try:
                 process.terminate()
-                self.db.update_cloned_bot_status(bot_id, 'stopped')
-                del self.running_bots[bot_id]
-                logger.info(f"Stopped bot {bot_id} (PID: {process.pid})")
-                return True
+                # Wait for the graceful shutdown so a restarted bot never polls the same token alongside it
+                try:
+                    await asyncio.wait_for(process.wait(), STOP_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Bot {bot_id} did not exit within {STOP_TIMEOUT_SECONDS} seconds. Killing it.")
+                    process.kill()
+                    await process.wait()
+                stopped = True
             except Exception as e:
                 logger.error(f"Error stopping bot {bot_id}: {e}")
-                return False
-        return False
+
+        # Cancelling the supervisor also drops a restart that is waiting out its backoff; it is only
+        # cancelled now so it keeps draining the process output until the process has exited
+        supervisor = self.supervisors.pop(bot_id, None)
+        if supervisor and not supervisor.done():
+            supervisor.cancel()
+            if process is None:
+                # No process is attached while the bot waits out its restart backoff; dropping the
+                # pending restart stops it just the same
+                stopped = True
+        self.restart_attempts.pop(bot_id, None)
+
+        if stopped:
+            self.db.update_cloned_bot_status(bot_id, 'stopped')
+            logger.info(f"Stopped bot {bot_id}" + (f" (PID: {process.pid})" if process else " during its restart backoff"))
+        return stopped
 
 # Example usage (for testing purposes, will be integrated into the main bot.py)
 # if __name__ == "__main__":
@@ -146,7 +291,4 @@ class BotManager:
 #     manager = BotManager(db)
 #     
 #     # Start all existing bots
-#     manager.start_all_cloned_bots()
-#     
-#     # Start monitoring
-#     asyncio.run(manager.start_monitoring())
+#     asyncio.run(manager.start_all_cloned_bots())
@@ -0,0 +1,62 @@
+"""
+Message Type Classification
+The real-time forwarder classifies python-telegram-bot messages and the historical forwarder
+classifies Telethon messages, both into the same Bot API type names, so each message is inspected once
+"""
+
+from typing import Optional
+
+# Checked in order; the first attribute that is set decides the message type
+MESSAGE_TYPES = (
+    "text",
+    "photo",
+    "video",
+    "animation",
+    "document",
+    "audio",
+    "voice",
+    "sticker",
+    "location",
+    "contact",
+    "poll",
+)
+
+
+def classify_message(message) -> Optional[str]:
+    """Return the message type name, or None if the message type is unsupported"""
+    for message_type in MESSAGE_TYPES:
+        if getattr(message, message_type, None):
+            return message_type
+    return None
+
+
+# Telethon message properties and the Bot API type name recorded for each. Telethon reports GIFs, round
+# videos and video stickers as videos too, and every media type from gif to audio as a document, so the
+# specific kinds come first
+TELETHON_MESSAGE_TYPES = (
+    ("photo", "photo"),
+    ("gif", "animation"),
+    ("video_note", "video_note"),
+    ("sticker", "sticker"),
+    ("video", "video"),
+    ("voice", "voice"),
+    ("audio", "audio"),
+    ("document", "document"),
+    ("venue", "venue"),
+    ("geo", "location"),
+    ("contact", "contact"),
+    ("poll", "poll"),
+    ("dice", "dice"),
+)
+
+
+def classify_telethon_message(message) -> Optional[str]:
+    """Return the Bot API type name of a Telethon message, or None if the message type is unsupported"""
+    for attribute, message_type in TELETHON_MESSAGE_TYPES:
+        if getattr(message, attribute, None):
+            return message_type
+    # Telethon's message text doubles as the media caption, so it only means a text message
+    # when no media (other than a link preview) is attached
+    if message.message and (message.media is None or message.web_preview):
+        return "text"
+    return None
@@ -36,10 +36,11 @@ async def main():
         await client.start()
         print("Login successful! The session file has been created.")
         
-        # Check if the session file exists
-        if os.path.exists(SESSION_FILE):
-            print(f"SUCCESS: The file '{SESSION_FILE}' is ready for use.")
-        else:
+        # Check that the session file landed on disk
+        try:
+            session_size = os.stat(SESSION_FILE).st_size
+            print(f"SUCCESS: The file '{SESSION_FILE}' ({session_size} bytes) is ready for use.")
+        except FileNotFoundError:
             print("WARNING: Login succeeded, but the session file was not found. Check permissions.")
             
     except Exception as e: